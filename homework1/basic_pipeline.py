@@ -4,8 +4,33 @@ Temel NLP Pipeline - NLTK olmadan çalışır
 """
 
 import re
+from array import array
 from collections import Counter
 
+import metrics
+from token_ids import EncodedCorpus
+from text_utils import check_language, dedup_texts, fan_out, duplicate_ratio
+
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_DIGIT_RE = re.compile(r'\d+')
+
+# Dil başına stopword kümeleri (modül yüklenirken bir kez oluşturulur)
+STOPWORDS = {
+    'english': frozenset({
+        'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
+        'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
+        'to', 'was', 'will', 'with', 'the', 'this', 'but', 'they', 'have',
+        'had', 'what', 'said', 'each', 'which', 'she', 'do', 'how', 'their',
+        'if', 'up', 'out', 'many', 'then', 'them', 'these', 'so', 'some',
+        'her', 'would', 'make', 'like', 'into', 'him', 'time', 'two', 'more',
+        'go', 'no', 'way', 'could', 'my', 'than', 'first', 'been', 'call',
+        'who', 'oil', 'sit', 'now', 'find', 'down', 'day', 'did', 'get',
+        'come', 'made', 'may', 'part', 'i', 'am', 'is', 'are', 'was', 'were',
+        'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
+        'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can'
+    })
+}
+
 def basic_tokenize(text):
     #Basit tokenization
     return text.split()
@@ -16,56 +41,55 @@ def basic_lowercase(text):
 
 def basic_clean(text):
     #Noktalama ve sayıları temizle
-    text = re.sub(r'[^\w\s]', '', text)
-    text = re.sub(r'\d+', ' ', text)
+    text = _PUNCT_RE.sub('', text)
+    text = _DIGIT_RE.sub(' ', text)
     return text
 
 def basic_remove_stopwords(tokens, language='english'):
     #Basit stopword temizliği"
-    if language == 'english':
-        stopwords = {
-            'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
-            'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
-            'to', 'was', 'will', 'with', 'the', 'this', 'but', 'they', 'have',
-            'had', 'what', 'said', 'each', 'which', 'she', 'do', 'how', 'their',
-            'if', 'up', 'out', 'many', 'then', 'them', 'these', 'so', 'some',
-            'her', 'would', 'make', 'like', 'into', 'him', 'time', 'two', 'more',
-            'go', 'no', 'way', 'could', 'my', 'than', 'first', 'been', 'call',
-            'who', 'oil', 'sit', 'now', 'find', 'down', 'day', 'did', 'get',
-            'come', 'made', 'may', 'part', 'i', 'am', 'is', 'are', 'was', 'were',
-            'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
-            'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can'
-        }
-    else:
-        stopwords = set()
-    
+    stopwords = STOPWORDS.get(language, frozenset())
     return [token for token in tokens if token not in stopwords]
 
-def basic_lemmatize(tokens):
-    #Basit lemmatization
+def _basic_lemma(token, pos=None):
     # Basit kurallar
-    lemmatized = []
-    for token in tokens:
-        # -ing -> -e (running -> run)
-        if token.endswith('ing'):
-            token = token[:-3]
-        # -ed -> -e (learned -> learn)
-        elif token.endswith('ed'):
-            token = token[:-2]
-        # -s -> - (books -> book)
-        elif token.endswith('s') and len(token) > 3:
-            token = token[:-1]
-        lemmatized.append(token)
-    return lemmatized
-
-def basic_preprocess_texts(texts, language='english'):
-    
-    #Temel ön işleme pipeline'ı
-    
-    processed_texts = []
-    stats = []
-    
-    for text in texts:
+    # -ing -> -e (running -> run)
+    if token.endswith('ing'):
+        token = token[:-3]
+    # -ed -> -e (learned -> learn)
+    elif token.endswith('ed'):
+        token = token[:-2]
+    # -s -> - (books -> book)
+    elif token.endswith('s') and len(token) > 3:
+        token = token[:-1]
+    return token
+
+def basic_lemmatize(tokens, cache=None):
+    #Basit lemmatization
+    #cache: isteğe bağlı LemmaCache; kurallar önbellek aramasından ucuz olduğu için varsayılan önbelleksiz
+    if cache is None:
+        return [_basic_lemma(token) for token in tokens]
+    return [cache.lookup(token, None, _basic_lemma) for token in tokens]
+
+class BasicPipeline:
+    """
+    Dil başına bir kez kurulan temel pipeline.
+    Stopword kümesi kurulumda seçilir; process çağrıları yalnızca işi yapar.
+    lemma_cache: isteğe bağlı LemmaCache (varsayılan: önbelleksiz kural tabanlı lemmatization)
+    """
+
+    def __init__(self, language='english', lemma_cache=None):
+        check_language(language)
+        self.language = language
+        self._stopwords = STOPWORDS.get(language, frozenset())
+        self._lemma_cache = lemma_cache
+
+    def process_one(self, text, timer=metrics.NULL_TIMER):
+        """Tek bir metni işler. Returns: (processed_text, stat)"""
+        tokens, stat = self.process_tokens(text, timer)
+        return ' '.join(tokens), stat
+
+    def process_tokens(self, text, timer=metrics.NULL_TIMER):
+        """Tek bir metni işler. Returns: (tokens, stat)"""
         orig_len = len(text.split())
         
         # 1. Lowercase
@@ -73,53 +97,167 @@ def basic_preprocess_texts(texts, language='english'):
         
         # 2. Temizlik
         text = basic_clean(text)
+        timer.lap('clean')
         
         # 3. Tokenization
         tokens = basic_tokenize(text)
+        timer.lap('tokenize', len(tokens))
         
         # 4. Stopword temizliği
         stopword_count = len(tokens)
-        tokens = basic_remove_stopwords(tokens, language)
+        sw = self._stopwords
+        tokens = [token for token in tokens if token not in sw]
         stopword_count -= len(tokens)
+        timer.lap('stopwords', len(tokens))
         
         # 5. Lemmatization
-        tokens = basic_lemmatize(tokens)
-        
-        processed_texts.append(' '.join(tokens))
+        tokens = basic_lemmatize(tokens, self._lemma_cache)
+        timer.lap('lemmatize', len(tokens))
         
-        stats.append({
+        return tokens, {
             'original_word_count': orig_len,
             'stopwords_removed': stopword_count,
             'final_word_count': len(tokens)
-        })
+        }
+
+    def process(self, texts, output='text', vocabulary=None):
+        """
+        output: 'text' (boşlukla birleştirilmiş string'ler) veya 'ids' (EncodedCorpus)
+        vocabulary: output='ids' için kullanılacak Vocabulary (varsayılan: yeni sözlük)
+        Returns: processed_texts, stats
+        """
+        # Ölçüm açıksa (metrics.enable) aşama süreleri ve token sayıları kaydedilir
+        timer = metrics.stage_timer('basic')
+        processed_texts = EncodedCorpus(vocabulary) if output == 'ids' else []
+        add = processed_texts.append
+        stats = []
+        for text in texts:
+            tokens, stat = self.process_tokens(text, timer)
+            add(tokens if output == 'ids' else ' '.join(tokens))
+            stats.append(stat)
+        timer.flush(len(stats))
+        return processed_texts, stats
+
+_pipelines = {}
+
+def get_basic_pipeline(language='english'):
+    #Dil başına tek bir BasicPipeline örneği döndürür
+    pipeline = _pipelines.get(language)
+    if pipeline is None:
+        pipeline = _pipelines.setdefault(language, BasicPipeline(language))
+    return pipeline
+
+def basic_preprocess_texts(texts, language='english', dedup=False, output='text'):
+    
+    #Temel ön işleme pipeline'ı
+    #dedup=True ise aynı metinler bir kez işlenir
+    #output='ids' ise processed_texts bir EncodedCorpus'tur (int32 token id'leri)
+    #Dönüş her zaman: processed_texts, stats, duplicate_ratio (dedup=False ise 0.0)
     
-    return processed_texts, stats
+    if dedup:
+        unique_texts, positions = dedup_texts(texts)
+        processed_texts, stats = get_basic_pipeline(language).process(unique_texts, output=output)
+        return (*fan_out(processed_texts, stats, positions), duplicate_ratio(unique_texts, positions))
+    return (*get_basic_pipeline(language).process(texts, output=output), 0.0)
+
+class SparseMatrix:
+    """
+    CSR (sıkıştırılmış satır) düzeninde, array tabanlı sayım matrisi.
+    data/indices/indptr düz int dizileridir; dense görünüm yalnızca istenirse üretilir.
+    """
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = shape
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def row(self, i):
+        #i. satırın dense (liste) görünümü
+        dense = [0] * self.shape[1]
+        for k in range(self.indptr[i], self.indptr[i + 1]):
+            dense[self.indices[k]] = self.data[k]
+        return dense
+
+    def tolist(self):
+        #Tüm matrisin dense (liste listesi) görünümü
+        return [self.row(i) for i in range(self.shape[0])]
+
+    def column_sums(self):
+        sums = [0] * self.shape[1]
+        for j, value in zip(self.indices, self.data):
+            sums[j] += value
+        return sums
+
+    def __len__(self):
+        return self.shape[0]
 
-def basic_vectorize(texts, max_features=20):
+    def __iter__(self):
+        for i in range(self.shape[0]):
+            yield self.row(i)
+
+def most_frequent_terms(texts, n):
     
-    #Temel vektörleştirme
+    #En sık n terim (Counter.most_common sırasıyla)
+    #texts bir EncodedCorpus ise id sayımları kullanılır; metinler yeniden bölünmez
     
-    # Tüm kelimeleri topla
-    all_words = []
+    if isinstance(texts, EncodedCorpus):
+        counts = texts.term_counts()
+        # Eşit sayılarda ilk görülme (id) sırası korunur, most_common ile aynı
+        top = sorted(range(len(counts)), key=lambda i: -counts[i])[:n]
+        return [texts.vocabulary.terms[i] for i in top if counts[i]]
+    word_freq = Counter()
     for text in texts:
-        all_words.extend(text.split())
+        word_freq.update(text.split())
+    return [word for word, freq in word_freq.most_common(n)]
+
+def count_matrix(texts, feature_names):
     
-    # Kelime frekanslarını hesapla
-    word_freq = Counter(all_words)
+    #Terim -> sütun indeksini bir kez kurar, her metni tek geçişte sayar
+    #texts: string listesi veya EncodedCorpus (id -> sütun eşlemesiyle sayılır)
     
-    # En sık kelimeleri al (feature names)
-    feature_names = [word for word, freq in word_freq.most_common(max_features)]
+    if isinstance(texts, EncodedCorpus):
+        vocabulary = texts.vocabulary
+        column = {vocabulary.get(feature): j for j, feature in enumerate(feature_names)}
+        docs = iter(texts)
+    else:
+        column = {feature: j for j, feature in enumerate(feature_names)}
+        docs = (text.split() for text in texts)
+    data = array('i')
+    indices = array('i')
+    indptr = array('i', [0])
+    for words in docs:
+        counts = {}
+        for word in words:
+            j = column.get(word)
+            if j is not None:
+                counts[j] = counts.get(j, 0) + 1
+        for j in sorted(counts):
+            indices.append(j)
+            data.append(counts[j])
+        indptr.append(len(indices))
+    return SparseMatrix(data, indices, indptr, (len(indptr) - 1, len(feature_names)))
+
+def basic_vectorize(texts, max_features=20, dense=False):
     
-    # Matrix oluştur
-    matrix = []
-    for text in texts:
-        text_words = text.split()
-        row = []
-        for feature in feature_names:
-            count = text_words.count(feature)
-            row.append(count)
-        matrix.append(row)
+    #Temel vektörleştirme
+    #dense=True ise matris eskisi gibi liste listesi olarak döner
+    
+    timer = metrics.stage_timer('basic')
     
+    # En sık kelimeleri al (feature names); EncodedCorpus ise id'ler doğrudan sayılır
+    feature_names = most_frequent_terms(texts, max_features)
+    
+    # Matrix oluştur
+    matrix = count_matrix(texts, feature_names)
+    timer.lap('vectorize_count', matrix.nnz)
+    timer.flush()
+    if dense:
+        return feature_names, matrix.tolist()
     return feature_names, matrix
 
 def print_results(original_texts, processed_texts, stats, feature_names, matrix):
@@ -180,7 +318,7 @@ if __name__ == "__main__":
     ]
     
     # Ön işleme
-    processed_texts, stats = basic_preprocess_texts(corpus, language='english')
+    processed_texts, stats, _ = basic_preprocess_texts(corpus, language='english')
     
     # Vektörleştirme
     feature_names, matrix = basic_vectorize(processed_texts, max_features=20)
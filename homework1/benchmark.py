@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+"""
+Pipeline Performans Testi (Benchmark)
+- Üç uygulamayı (basic_pipeline, simple_pipeline, main) aynı korpuslar üzerinde karşılaştırır
+- Korpuslar: sample_data.txt'den çoğaltılan örnek korpus ve rastgele üretilen sentetik korpus
+- Her ön işleme adımı, uçtan uca pipeline ve her vektörleştirici ayrı ölçülür:
+  saniye, belge/saniye ve tracemalloc ile en yüksek bellek kullanımı
+  (main için adım süreleri pipeline'ın kendi StageTimer lap'lerinden okunur; bellek ölçülmez)
+- Sonuçlar JSON olarak kaydedilir; kayıtlı bir temel çizgiye (baseline) göre
+  eşikten fazla yavaşlama/bellek artışı varsa çıkış kodu 1 olur
+NLTK verisi eksik olan uygulamalar atlanır (sonuçta 'skipped' olarak görünür).
+
+Kullanım:
+    python benchmark.py
+    python benchmark.py --sizes 100 1000 10000 --repeat 3 --output sonuc.json
+    python benchmark.py --save-baseline benchmarks/baseline.json
+    python benchmark.py --baseline benchmarks/baseline.json --threshold 0.25
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+from datetime import datetime
+
+from basic_pipeline import (
+    get_basic_pipeline, basic_lowercase, basic_clean, basic_tokenize,
+    basic_lemmatize, basic_vectorize, STOPWORDS
+)
+import metrics
+from lemma_cache import wordnet_cache, wordnet_lemmatize
+from setup_nltk import missing_nltk_resources
+
+IMPLEMENTATIONS = ('basic', 'simple', 'main')
+CORPORA = ('sample', 'synthetic')
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_THRESHOLD = 0.25
+# Bu süreden kısa ölçümler gürültülü olduğu için regresyon kontrolüne girmez
+MIN_SECONDS = 0.005
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_data.txt')
+
+# ----------------------
+# Korpuslar
+# ----------------------
+def sample_corpus(size):
+    """sample_data.txt satırları istenen belge sayısına kadar tekrarlanır."""
+    with open(SAMPLE_PATH, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f if line.strip()]
+    return [lines[i % len(lines)] for i in range(size)]
+
+def synthetic_corpus(size, seed=0, vocab_size=5000, min_words=8, max_words=30):
+    """
+    Tekrarlanabilir rastgele korpus: Zipf benzeri kelime dağılımı, stopword'ler,
+    çekim ekleri (-s, -ed, -ing), sayılar ve noktalama içerir.
+    """
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    stems = [''.join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(vocab_size)]
+    weights = [1.0 / (rank + 1) for rank in range(vocab_size)]
+    stopwords = sorted(STOPWORDS['english'])
+    suffixes = ['', '', '', 's', 'ed', 'ing']
+    texts = []
+    for _ in range(size):
+        words = []
+        for _ in range(rng.randint(min_words, max_words)):
+            r = rng.random()
+            if r < 0.35:
+                words.append(rng.choice(stopwords))
+            elif r < 0.38:
+                words.append(str(rng.randint(0, 2024)))
+            else:
+                stem = rng.choices(stems, weights)[0]
+                words.append(stem + rng.choice(suffixes))
+        words[0] = words[0].capitalize()
+        texts.append(' '.join(words) + rng.choice(['.', '!', '?', '...']))
+    return texts
+
+def make_corpus(name, size):
+    return sample_corpus(size) if name == 'sample' else synthetic_corpus(size)
+
+# ----------------------
+# Uygulamalar: adımlar ve vektörleştiriciler
+# ----------------------
+# Her adım bir önceki adımın çıktısını (belge listesi) alır; adımlar yerine
+# fn(texts) -> {adım: saniye} verilirse adım süreleri tek bir çalıştırmadan okunur.
+# 'pipeline' uçtan uca işlemedir; vektörleştiriciler pipeline çıktısı üzerinde çalışır.
+
+def stage_laps(run, pipeline_name, stage_names):
+    """
+    run(texts)'i ölçüm açıkken çalıştırır; adım sürelerini pipeline'ın StageTimer
+    lap'lerinden (metrics.STAGE_SECONDS'taki artış) okur. Lap'i olmayan adımlar atlanır.
+    Returns: fn(texts) -> {adım: saniye}
+    """
+    def read():
+        return [metrics.STAGE_SECONDS.value(pipeline=pipeline_name, stage=stage) for stage in stage_names]
+
+    def measure_stages(texts):
+        was_enabled = metrics.enabled()
+        before = read()
+        metrics.enable()
+        try:
+            run(texts)
+        finally:
+            metrics.enable(was_enabled)
+        return {
+            stage: new - old
+            for stage, old, new in zip(stage_names, before, read())
+            if new > old
+        }
+    return measure_stages
+
+def _basic_benchmarks():
+    sw = STOPWORDS['english']
+    stages = [
+        ('lowercase', lambda docs: [basic_lowercase(t) for t in docs]),
+        ('clean', lambda docs: [basic_clean(t) for t in docs]),
+        ('tokenize', lambda docs: [basic_tokenize(t) for t in docs]),
+        ('stopwords', lambda docs: [[w for w in tokens if w not in sw] for tokens in docs]),
+        ('lemmatize', lambda docs: [basic_lemmatize(tokens) for tokens in docs])
+    ]
+    pipeline = lambda texts: get_basic_pipeline('english').process(texts)[0]
+    vectorizers = [('basic', lambda processed: basic_vectorize(processed, max_features=20))]
+    return stages, pipeline, vectorizers
+
+def _simple_benchmarks():
+    from nltk.tokenize import word_tokenize
+    from nltk.corpus import stopwords
+    from simple_pipeline import simple_preprocess_texts, simple_vectorize
+
+    sw = set(stopwords.words('english'))
+    stages = [
+        ('lowercase', lambda docs: [t.lower() for t in docs]),
+        ('clean', lambda docs: [re.sub(r'\d+', ' ', re.sub(r'[^\w\s]', '', t)) for t in docs]),
+        ('tokenize', lambda docs: [word_tokenize(t) for t in docs]),
+        ('stopwords', lambda docs: [[w for w in tokens if w not in sw] for tokens in docs]),
+        ('lemmatize', lambda docs: [[wordnet_lemmatize(w) for w in tokens] for tokens in docs])
+    ]
+    pipeline = lambda texts: simple_preprocess_texts(texts)[0]
+    vectorizers = [('simple', lambda processed: simple_vectorize(processed))]
+    return stages, pipeline, vectorizers
+
+def _main_benchmarks():
+    from main import get_pipeline, vectorize_texts
+    from incremental_tfidf import IncrementalTfidf
+
+    pipeline_obj = get_pipeline('english')
+    pipeline = lambda texts: pipeline_obj.process(texts)['processed_texts']
+    # POS tagging lemmatize'dan ayrı raporlanır
+    stages = stage_laps(pipeline, 'main', ('clean', 'tokenize', 'stopwords', 'pos_tagging', 'lemmatize'))
+    vectorizers = [
+        ('tfidf', lambda processed: vectorize_texts(processed, method='tfidf', sparse=True)),
+        ('count', lambda processed: vectorize_texts(processed, method='count', sparse=True)),
+        ('hashing', lambda processed: vectorize_texts(processed, method='hashing', sparse=True, use_idf=True)),
+        ('incremental_tfidf', lambda processed: IncrementalTfidf().fit_transform(processed))
+    ]
+    return stages, pipeline, vectorizers
+
+_BENCHMARKS = {
+    'basic': (_basic_benchmarks, []),
+    'simple': (_simple_benchmarks, ['punkt', 'stopwords', 'wordnet']),
+    'main': (_main_benchmarks, ['punkt', 'stopwords', 'wordnet', 'averaged_perceptron_tagger'])
+}
+
+# ----------------------
+# Ölçüm
+# ----------------------
+def _clear_caches():
+    # Lemma önbelleği her tekrardan önce boşaltılır; ölçüm gerçek lemmatization işini içerir
+    wordnet_cache.clear()
+
+def measure(fn, arg, repeat=3):
+    """
+    fn(arg)'ı repeat kez çalıştırır; en iyi süreyi ve ayrı bir çalıştırmada
+    tracemalloc ile ölçülen en yüksek bellek kullanımını döndürür.
+    Returns: (output, seconds, peak_bytes)
+    """
+    best = None
+    for _ in range(repeat):
+        _clear_caches()
+        start = time.perf_counter()
+        output = fn(arg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    _clear_caches()
+    tracemalloc.start()
+    try:
+        fn(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return output, best, peak
+
+def measure_stages(stage_seconds, texts, repeat=3):
+    """stage_seconds(texts)'i repeat kez çalıştırır. Returns: {adım: en iyi süre}"""
+    best = {}
+    for _ in range(repeat):
+        _clear_caches()
+        for stage, seconds in stage_seconds(texts).items():
+            best[stage] = min(best.get(stage, seconds), seconds)
+    return best
+
+def _entry(implementation, corpus, size, name, seconds, peak):
+    return {
+        'implementation': implementation,
+        'corpus': corpus,
+        'size': size,
+        'name': name,
+        'seconds': seconds,
+        'docs_per_sec': size / seconds if seconds else None,
+        'peak_bytes': peak
+    }
+
+def run_benchmarks(implementations=IMPLEMENTATIONS, corpora=CORPORA, sizes=DEFAULT_SIZES, repeat=3, log=print):
+    """
+    Seçilen uygulama/korpus/boyut kombinasyonlarını ölçer.
+    Returns: {'meta': ..., 'results': [...], 'skipped': {uygulama: sebep}}
+    """
+    results = []
+    skipped = {}
+    for implementation in implementations:
+        factory, required = _BENCHMARKS[implementation]
+        missing = missing_nltk_resources(required) if required else []
+        if missing:
+            skipped[implementation] = f"Eksik NLTK verileri: {', '.join(missing)}"
+            log(f"- {implementation}: atlandı ({skipped[implementation]})")
+            continue
+        stages, pipeline, vectorizers = factory()
+        for corpus in corpora:
+            for size in sizes:
+                texts = make_corpus(corpus, size)
+                # Adım adım
+                if callable(stages):
+                    for stage_name, seconds in measure_stages(stages, texts, repeat).items():
+                        results.append(_entry(implementation, corpus, size, f'stage:{stage_name}', seconds, None))
+                else:
+                    docs = texts
+                    for stage_name, stage in stages:
+                        docs, seconds, peak = measure(stage, docs, repeat)
+                        results.append(_entry(implementation, corpus, size, f'stage:{stage_name}', seconds, peak))
+                # Uçtan uca
+                processed, seconds, peak = measure(pipeline, texts, repeat)
+                results.append(_entry(implementation, corpus, size, 'pipeline', seconds, peak))
+                log(f"- {implementation:6s} {corpus:9s} {size:>7d} belge: "
+                    f"{seconds:8.3f} sn, {size / seconds if seconds else float('inf'):10.0f} belge/sn, "
+                    f"en yüksek bellek {peak / 1024**2:8.2f} MB")
+                # Vektörleştiriciler
+                for vec_name, vectorize in vectorizers:
+                    _, seconds, peak = measure(vectorize, processed, repeat)
+                    results.append(_entry(implementation, corpus, size, f'vectorize:{vec_name}', seconds, peak))
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat
+        },
+        'results': results,
+        'skipped': skipped
+    }
+
+# ----------------------
+# Temel çizgi (baseline) karşılaştırması
+# ----------------------
+def _key(entry):
+    return (entry['implementation'], entry['corpus'], entry['size'], entry['name'])
+
+def compare_to_baseline(report, baseline, threshold=DEFAULT_THRESHOLD, min_seconds=MIN_SECONDS):
+    """
+    Her ölçümü temel çizgideki karşılığıyla karşılaştırır.
+    Süre veya en yüksek bellek (1 + threshold) katından fazla artmışsa regresyon sayılır.
+    Returns: regresyon listesi (boşsa sorun yok)
+    """
+    reference = {_key(entry): entry for entry in baseline['results']}
+    regressions = []
+    for entry in report['results']:
+        base = reference.get(_key(entry))
+        if base is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            old, new = base[metric], entry[metric]
+            if metric == 'seconds' and max(old, new) < min_seconds:
+                continue
+            if old and new and new > old * (1 + threshold):
+                regressions.append({
+                    'key': '/'.join(str(part) for part in _key(entry)),
+                    'metric': metric,
+                    'baseline': old,
+                    'current': new,
+                    'change': new / old - 1
+                })
+    return regressions
+
+def save_report(report, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+def load_report(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='NLP pipeline performans testi')
+    parser.add_argument('--implementations', nargs='+', choices=IMPLEMENTATIONS, default=list(IMPLEMENTATIONS))
+    parser.add_argument('--corpora', nargs='+', choices=CORPORA, default=list(CORPORA))
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=3, help='her ölçüm için tekrar sayısı (en iyisi alınır)')
+    parser.add_argument('--output', help='sonuçların yazılacağı JSON dosyası')
+    parser.add_argument('--save-baseline', help='sonuçları temel çizgi olarak kaydet')
+    parser.add_argument('--baseline', help='karşılaştırılacak temel çizgi JSON dosyası')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='izin verilen en fazla artış oranı (0.25 = %%25)')
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("NLP PIPELINE BENCHMARK")
+    print("=" * 60)
+    report = run_benchmarks(args.implementations, args.corpora, args.sizes, args.repeat)
+
+    if args.output:
+        save_report(report, args.output)
+        print(f"\nSonuçlar kaydedildi: {args.output}")
+    if args.save_baseline:
+        save_report(report, args.save_baseline)
+        print(f"\nTemel çizgi kaydedildi: {args.save_baseline}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(report, load_report(args.baseline), args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} regresyon bulundu (eşik: %{args.threshold * 100:.0f}):")
+            for r in regressions:
+                print(f"   {r['key']} [{r['metric']}]: {r['baseline']:.4g} -> {r['current']:.4g} "
+                      f"(+%{r['change'] * 100:.0f})")
+            return 1
+        print(f"\n✓ Temel çizgiye göre regresyon yok (eşik: %{args.threshold * 100:.0f})")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
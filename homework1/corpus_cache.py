@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Kalıcı Ön İşleme Önbelleği (memory-mapped)
+- Anahtar: korpus parmak izi (metinlerin SHA-256 özeti) + çıktıyı etkileyen pipeline ayarları
+- Her girdi bir dizindir: token id'leri (int32), belge sınırları (int64), belge istatistikleri
+  (int32) ham ikili dosyalar; sözlük ve üst bilgi JSON olarak saklanır
+- Tekrar açılırken diziler np.memmap ile eşlenir: kopya yapılmaz, yalnızca erişilen sayfalar okunur
+- Yazma geçici dizine yapılır ve tek bir rename ile yayımlanır; yarım kalan girdi görünmez
+Vektörleştirme ayarları değiştiğinde tokenization / POS tagging / lemmatization tekrarlanmaz.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+
+import numpy as np
+
+from process_cache import cache_key
+from token_ids import Vocabulary, EncodedCorpus
+
+FORMAT_VERSION = 1
+DEFAULT_CACHE_DIR = 'corpus_cache'
+STAT_FIELDS = ('original_word_count', 'stopwords_removed', 'final_word_count')
+# Çıktıyı değiştirmeyen ayarlar anahtara girmez (ör. işçi sayısı, spaCy grup boyutu)
+_IGNORED_OPTIONS = ('lemma_cache', 'workers', 'chunksize', 'spacy_batch_size', 'spacy_n_process', 'dedup')
+
+_IDS_FILE = 'ids.i4'
+_OFFSETS_FILE = 'offsets.i8'
+_STATS_FILE = 'stats.i4'
+_VOCABULARY_FILE = 'vocabulary.json'
+_META_FILE = 'meta.json'
+
+
+def corpus_fingerprint(texts):
+    """Metinlerin sırasına ve içeriğine bağlı SHA-256 özeti (hex)."""
+    digest = hashlib.sha256()
+    for text in texts:
+        data = text.encode('utf-8')
+        # Uzunluk öneki: ['ab', 'c'] ile ['a', 'bc'] farklı özet verir
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def file_fingerprint(filepath, columns=None, encoding='utf-8', chunk_size=1024**2):
+    """
+    Dosya içeriğinin SHA-256 özeti; metinleri belleğe almadan parmak izi üretir.
+    columns, encoding: iter_texts_from_file'a verilen okuma ayarlarıyla aynı olmalıdır;
+    aynı dosyadan farklı sütunlar okunursa farklı parmak izi üretilir.
+    """
+    digest = hashlib.sha256()
+    # Okuma ayarları da özete girer
+    options = json.dumps({'columns': columns, 'encoding': encoding}, sort_keys=True, ensure_ascii=False)
+    digest.update(options.encode('utf-8'))
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def corpus_key(fingerprint, config):
+    """Parmak izi + pipeline ayarlarından (Pipeline.config) önbellek anahtarı."""
+    options = {k: v for k, v in config.items() if k not in _IGNORED_OPTIONS}
+    return cache_key({'version': FORMAT_VERSION, 'corpus': fingerprint, 'config': options})
+
+
+def _open_array(path, dtype, shape):
+    # Boş dosya mmap ile eşlenemez
+    if not shape[0]:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=shape)
+
+
+class CachedStats:
+    """
+    (belge x 3) istatistik dizisi üzerinde salt okunur liste görünümü;
+    elemanlar preprocess_texts çıktısındaki gibi sözlüktür, istek anında oluşturulur.
+    """
+
+    def __init__(self, array):
+        self.array = array
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, i):
+        return dict(zip(STAT_FIELDS, self.array[i].tolist()))
+
+    def __iter__(self):
+        for i in range(len(self.array)):
+            yield self[i]
+
+
+class CorpusWriter:
+    """
+    Ön işleme sonuçlarını gruplar halinde geçici dizine ekler; commit ile yayımlar.
+    Tüm gruplar aynı Vocabulary'yi kullanmalıdır (writer.vocabulary).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        os.makedirs(self.tmp_path)
+        self.vocabulary = Vocabulary()
+        self.documents = 0
+        self.tokens = 0
+        self._ids = open(os.path.join(self.tmp_path, _IDS_FILE), 'wb')
+        self._offsets = open(os.path.join(self.tmp_path, _OFFSETS_FILE), 'wb')
+        self._stats = open(os.path.join(self.tmp_path, _STATS_FILE), 'wb')
+        np.zeros(1, dtype='<i8').tofile(self._offsets)
+
+    def write(self, corpus, stats):
+        """corpus: bu grubun EncodedCorpus'u, stats: aynı sırada belge istatistikleri."""
+        if corpus.vocabulary is not self.vocabulary:
+            raise ValueError("Gruplar writer.vocabulary ile kodlanmalı")
+        np.asarray(corpus.ids, dtype='<i4').tofile(self._ids)
+        offsets = np.asarray(corpus.offsets, dtype='<i8')[1:] + self.tokens
+        offsets.tofile(self._offsets)
+        np.array([[stat[field] for field in STAT_FIELDS] for stat in stats], dtype='<i4').tofile(self._stats)
+        self.documents += len(corpus)
+        self.tokens += len(corpus.ids)
+
+    def _close(self):
+        for f in (self._ids, self._offsets, self._stats):
+            f.close()
+
+    def commit(self, meta=None):
+        """Sözlük ve üst bilgiyi yazar, geçici dizini tek adımda hedef dizine taşır."""
+        self._close()
+        with open(os.path.join(self.tmp_path, _VOCABULARY_FILE), 'w', encoding='utf-8') as f:
+            json.dump(self.vocabulary.terms, f, ensure_ascii=False)
+        meta = dict(meta or {})
+        meta.update({
+            'version': FORMAT_VERSION,
+            'documents': self.documents,
+            'tokens': self.tokens,
+            'vocabulary_size': len(self.vocabulary),
+            'created_at': time.time()
+        })
+        with open(os.path.join(self.tmp_path, _META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        try:
+            os.replace(self.tmp_path, self.path)
+        except OSError:
+            # Aynı girdiyi başka bir süreç daha önce yayımladı
+            shutil.rmtree(self.tmp_path, ignore_errors=True)
+        return self.path
+
+    def abort(self):
+        self._close()
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+
+
+def open_corpus(path):
+    """
+    Yayımlanmış bir girdiyi açar; diziler memmap olarak eşlenir (kopya yapılmaz).
+    Returns: (EncodedCorpus, CachedStats, meta)
+    """
+    with open(os.path.join(path, _META_FILE), encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Desteklenmeyen önbellek sürümü: {meta.get('version')}")
+    with open(os.path.join(path, _VOCABULARY_FILE), encoding='utf-8') as f:
+        vocabulary = Vocabulary(json.load(f))
+    n_docs, n_tokens = meta['documents'], meta['tokens']
+    corpus = EncodedCorpus(
+        vocabulary,
+        ids=_open_array(os.path.join(path, _IDS_FILE), '<i4', (n_tokens,)),
+        offsets=_open_array(os.path.join(path, _OFFSETS_FILE), '<i8', (n_docs + 1,))
+    )
+    stats = CachedStats(_open_array(os.path.join(path, _STATS_FILE), '<i4', (n_docs, len(STAT_FIELDS))))
+    return corpus, stats, meta
+
+
+class CorpusCache:
+    """Önbellek dizini: anahtar -> yayımlanmış korpus dizini."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key):
+        """Girdi varsa (corpus, stats, meta), yoksa None."""
+        try:
+            entry = open_corpus(self.path(key))
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def writer(self, key):
+        return CorpusWriter(self.path(key))
+
+    def clear(self):
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_dir():
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def stats(self):
+        entries = [e for e in os.scandir(self.cache_dir) if e.is_dir() and not e.name.endswith('.tmp')]
+        total = self.hits + self.misses
+        return {
+            'entries': len(entries),
+            'cache_dir': self.cache_dir,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0
+        }
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Artımlı (online) TF-IDF
+- Belge frekanslarını (df) yeni gelen gruplarla güncelleyen partial_fit
+- Güncel IDF ile yeni belgeleri dönüştürme (transform)
+- Durumun diske kaydedilmesi ve geri yüklenmesi (checkpoint)
+Sonuçlar, aynı korpus üzerinde tek seferde eğitilmiş TfidfVectorizer ile aynıdır
+(sütun sırası hariç: yeni terimler sözlüğün sonuna eklenir).
+"""
+
+import os
+import re
+import json
+from array import array
+
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+# sklearn CountVectorizer/TfidfVectorizer varsayılan token deseni
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+
+def _to_numpy(buffer, dtype):
+    # array.array'in kopyası alınır; görünüm (view) kalırsa array büyütülemez
+    return np.frombuffer(buffer, dtype=dtype).copy()
+
+
+class IncrementalTfidf:
+    """
+    Çalışan belge frekansı sayaçlarıyla TF-IDF.
+    Sözlük yalnızca büyür; mevcut terimlerin sütun indeksleri değişmez.
+    """
+
+    def __init__(self, lowercase=True, smooth_idf=True, sublinear_tf=False, norm='l2'):
+        self.lowercase = lowercase
+        self.smooth_idf = smooth_idf
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.vocabulary = {}
+        self.df = array('q')
+        self.n_docs = 0
+        self._tokenize = re.compile(TOKEN_PATTERN).findall
+        self._idf = None
+
+    def _analyze(self, text):
+        return self._tokenize(text.lower() if self.lowercase else text)
+
+    def partial_fit(self, texts):
+        """Yeni bir grup belgeyle belge frekanslarını günceller."""
+        vocabulary = self.vocabulary
+        df = self.df
+        n = 0
+        for text in texts:
+            # İlk görülme sırası: sütun sırası karma (hash) tohumundan bağımsız, tekrarlanabilir
+            for term in dict.fromkeys(self._analyze(text)):
+                col = vocabulary.get(term)
+                if col is None:
+                    col = len(vocabulary)
+                    vocabulary[term] = col
+                    df.append(0)
+                df[col] += 1
+            n += 1
+        self.n_docs += n
+        self._idf = None
+        return self
+
+    @property
+    def idf_(self):
+        """Güncel IDF ağırlıkları (bir sonraki partial_fit'e kadar önbelleklenir)."""
+        if self._idf is None:
+            df = _to_numpy(self.df, np.int64)
+            smooth = int(self.smooth_idf)
+            self._idf = np.log((self.n_docs + smooth) / (df + smooth)) + 1
+        return self._idf
+
+    def get_feature_names_out(self):
+        names = [None] * len(self.vocabulary)
+        for term, col in self.vocabulary.items():
+            names[col] = term
+        return np.asarray(names, dtype=object)
+
+    def transform(self, texts, dtype=np.float64):
+        """Belgeleri güncel IDF ile CSR TF-IDF matrisine çevirir; bilinmeyen terimler atlanır."""
+        vocabulary = self.vocabulary
+        data = array('d')
+        indices = array('q')
+        indptr = array('q', [0])
+        for text in texts:
+            counts = {}
+            for term in self._analyze(text):
+                col = vocabulary.get(term)
+                if col is not None:
+                    counts[col] = counts.get(col, 0) + 1
+            for col in sorted(counts):
+                indices.append(col)
+                data.append(counts[col])
+            indptr.append(len(indices))
+        X = sparse.csr_matrix(
+            (_to_numpy(data, np.float64), _to_numpy(indices, np.int64), _to_numpy(indptr, np.int64)),
+            shape=(len(indptr) - 1, len(vocabulary))
+        )
+        if self.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1
+        X = X @ sparse.diags(self.idf_)
+        if self.norm and X.shape[1]:
+            X = normalize(X, norm=self.norm, copy=False)
+        return X.astype(dtype, copy=False).tocsr()
+
+    def fit_transform(self, texts, dtype=np.float64):
+        texts = list(texts)
+        return self.partial_fit(texts).transform(texts, dtype=dtype)
+
+    # ----------------------
+    # Checkpoint
+    # ----------------------
+    def save(self, path):
+        """Durumu .npz olarak kaydeder; yazma atomiktir (yarım dosya oluşmaz)."""
+        meta = {
+            'n_docs': self.n_docs,
+            'lowercase': self.lowercase,
+            'smooth_idf': self.smooth_idf,
+            'sublinear_tf': self.sublinear_tf,
+            'norm': self.norm
+        }
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                vocabulary=np.asarray(self.get_feature_names_out(), dtype=str),
+                df=_to_numpy(self.df, np.int64),
+                meta=np.asarray(json.dumps(meta))
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """save ile kaydedilen durumu yükler; partial_fit kaldığı yerden devam eder."""
+        with np.load(path, allow_pickle=False) as f:
+            terms = f['vocabulary'].tolist()
+            df = f['df']
+            meta = json.loads(f['meta'].item())
+        model = cls(
+            lowercase=meta['lowercase'],
+            smooth_idf=meta['smooth_idf'],
+            sublinear_tf=meta['sublinear_tf'],
+            norm=meta['norm']
+        )
+        model.vocabulary = {term: col for col, term in enumerate(terms)}
+        model.df.frombytes(df.astype(np.int64).tobytes())
+        model.n_docs = meta['n_docs']
+        return model
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Arka Plan İş Kuyruğu
+- Büyük /process istekleri hemen bir iş kimliği (job_id) ile yanıtlanır
+- İşler, istek thread'lerinden ayrı, sınırlı boyutlu bir işçi havuzunda çalışır
+- İlerleme (işlenen / toplam belge) ve sonuç durum sorgusuyla izlenir
+"""
+
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class JobQueue:
+    """
+    fn(progress) çağrılarını arka planda çalıştırır; progress(done) ile ilerleme bildirilir.
+    Tamamlanan işlerden en fazla max_finished tanesi sorgulanmak üzere tutulur.
+    """
+
+    def __init__(self, max_workers=2, max_finished=1000):
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='nlp-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, total):
+        """İşi kuyruğa ekler ve job_id döndürür."""
+        job_id = uuid.uuid4().hex
+        job = {
+            'job_id': job_id,
+            'status': QUEUED,
+            'done': 0,
+            'total': total,
+            'result': None,
+            'error': None,
+            'created_at': time.time(),
+            'finished_at': None
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        self._executor.submit(self._run, job, fn)
+        return job_id
+
+    def _run(self, job, fn):
+        job['status'] = RUNNING
+
+        def progress(done):
+            job['done'] = done
+
+        try:
+            job['result'] = fn(progress)
+            job['done'] = job['total']
+            job['status'] = DONE
+        except Exception as e:
+            job['error'] = str(e)
+            job['status'] = FAILED
+        job['finished_at'] = time.time()
+        self._prune()
+
+    def _prune(self):
+        # Yalnızca bitmiş işler silinir; kuyruktaki/çalışan işler her zaman sorgulanabilir
+        with self._lock:
+            finished = [jid for jid, j in self._jobs.items() if j['status'] in (DONE, FAILED)]
+            for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+                del self._jobs[job_id]
+
+    def get(self, job_id):
+        """İşin anlık durumunun bir kopyasını döndürür; yoksa None."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def stats(self):
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job['status']] += 1
+            return counts
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
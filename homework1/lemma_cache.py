@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Lemmatization Önbelleği
+- (token, POS) -> lemma eşlemesi için sınırlı boyutlu LRU önbellek
+- İsabet (hit) / ıska (miss) sayaçları
+- Harici kütüphane gerektirmez; main, simple_pipeline ve basic_pipeline ortak kullanır
+"""
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 100000
+
+
+class LemmaCache:
+    """
+    (token, pos) anahtarlı LRU önbellek.
+    Süreç boyunca yaşar; çağrılar ve web istekleri arasında paylaşılır.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        if maxsize <= 0:
+            raise ValueError('maxsize pozitif olmalı!')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, token, pos, compute):
+        """Önbellekte varsa lemma'yı döndürür, yoksa compute(token, pos) ile hesaplayıp saklar."""
+        key = (token, pos)
+        with self._lock:
+            lemma = self._data.get(key)
+            if lemma is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return lemma
+            self.misses += 1
+        # Hesaplama kilit dışında yapılır; aynı anahtarın iki kez hesaplanması zararsızdır
+        lemma = compute(token, pos)
+        with self._lock:
+            self._data[key] = lemma
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return lemma
+
+    def stats(self):
+        """İsabet/ıska sayaçları ve doluluk bilgisi."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize
+            }
+
+    def clear(self):
+        """Önbelleği ve sayaçları sıfırlar."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+# ----------------------
+# WordNet lemmatizer için paylaşılan önbellek
+# ----------------------
+wordnet_cache = LemmaCache()
+_wordnet_lemmatizer = None
+
+
+def _wordnet_lemmatize(token, pos):
+    global _wordnet_lemmatizer
+    if _wordnet_lemmatizer is None:
+        from nltk.stem import WordNetLemmatizer
+        _wordnet_lemmatizer = WordNetLemmatizer()
+    return _wordnet_lemmatizer.lemmatize(token, pos)
+
+
+def wordnet_lemmatize(token, pos='n', cache=None):
+    """WordNetLemmatizer.lemmatize'ın önbellekli karşılığı."""
+    cache = wordnet_cache if cache is None else cache
+    return cache.lookup(token, pos, _wordnet_lemmatize)
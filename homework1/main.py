@@ -14,53 +14,399 @@ import os
 import re
 import sys
 import csv
+import gzip
+import math
+import numbers
 import warnings
+import threading
 from collections import Counter
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-
-# NLTK ve opsiyonel spaCy importları
-import nltk
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
-nltk.download('wordnet', quiet=True)
-nltk.download('omw-1.4', quiet=True)
-nltk.download('averaged_perceptron_tagger', quiet=True)
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-
-# Vektörleştirme için sklearn
-from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
-
-# Türkçe lemmatization için spaCy (isteğe bağlı)
-try:
-    import spacy
-    nlp_tr = spacy.blank('tr')
-except ImportError:
-    nlp_tr = None
-    warnings.warn("spaCy ve Türkçe model yüklü değil, Türkçe lemmatization devre dışı.")
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+import metrics
+from text_utils import dedup_texts, fan_out, duplicate_ratio, check_language
+from token_ids import EncodedCorpus
+from lemma_cache import wordnet_cache, wordnet_lemmatize
+from setup_nltk import check_nltk_resources
+
+# Not: modül içe aktarılırken hiçbir indirme yapılmaz. NLTK, sklearn, spaCy,
+# matplotlib ve wordcloud yalnızca ilgili adım kullanıldığında yüklenir.
+# Eksik NLTK verileri Pipeline kurulurken check_nltk_resources ile bildirilir.
 
 # ----------------------
-# Dosyadan okuma fonksiyonu
+# Türkçe lemmatization için spaCy (isteğe bağlı, ilk kullanımda yüklenir)
 # ----------------------
-def read_texts_from_file(filepath):
-    """txt veya csv dosyasından metinleri okur."""
-    texts = []
-    if filepath.endswith('.txt'):
-        with open(filepath, encoding='utf-8') as f:
-            texts = [line.strip() for line in f if line.strip()]
-    elif filepath.endswith('.csv'):
-        with open(filepath, encoding='utf-8') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                texts.extend([cell.strip() for cell in row if cell.strip()])
-    else:
+# Eğitilmiş bir Türkçe spaCy paketi kullanılacaksa adı (ör. NLPLAY_TURKISH_SPACY_MODEL=tr_core_news_md).
+# Verilmezse boş 'tr' dili + spacy-lookups-data'daki sözlük tabanlı lemmatizer kullanılır.
+TURKISH_SPACY_MODEL = os.environ.get('NLPLAY_TURKISH_SPACY_MODEL')
+# Lemmatization için gerekmeyen bileşenler hiç yüklenmez
+_SPACY_EXCLUDE = ['parser', 'ner', 'senter', 'textcat', 'textcat_multilabel', 'entity_linker', 'entity_ruler', 'span_ruler']
+
+_nlp_tr = None
+_nlp_tr_loaded = False
+
+def _load_nlp_tr(spacy):
+    if TURKISH_SPACY_MODEL:
+        return spacy.load(TURKISH_SPACY_MODEL, exclude=_SPACY_EXCLUDE)
+    nlp = spacy.blank('tr')
+    try:
+        nlp.add_pipe('lemmatizer', config={'mode': 'lookup'})
+        nlp.initialize()
+    except ValueError:
+        # spacy-lookups-data kurulu değil: yalnızca token metni kullanılır
+        if 'lemmatizer' in nlp.pipe_names:
+            nlp.remove_pipe('lemmatizer')
+        warnings.warn("spacy-lookups-data yüklü değil, Türkçe lemmatization tokenları değiştirmez.")
+    return nlp
+
+def _get_nlp_tr():
+    """spaCy Türkçe modelini ilk kullanımda yükler; spaCy yoksa None döner."""
+    global _nlp_tr, _nlp_tr_loaded
+    if not _nlp_tr_loaded:
+        try:
+            import spacy
+            _nlp_tr = _load_nlp_tr(spacy)
+        except ImportError:
+            _nlp_tr = None
+            warnings.warn("spaCy ve Türkçe model yüklü değil, Türkçe lemmatization devre dışı.")
+        _nlp_tr_loaded = True
+    return _nlp_tr
+
+# ----------------------
+# Dosyadan okuma fonksiyonları
+# ----------------------
+def iter_texts_from_file(filepath, columns=None, encoding='utf-8'):
+    """
+    txt veya csv dosyasından metinleri tembel (lazy) olarak okur, satır satır üretir.
+    .gz uzantılı sıkıştırılmış dosyalar da desteklenir (ör. veri.csv.gz).
+    columns: csv için okunacak sütunlar; indeks (int) veya başlık adı (str) listesi.
+             Başlık adı verilirse ilk satır başlık kabul edilir.
+             None ise her satırdaki boş olmayan tüm hücreler okunur.
+    """
+    base = filepath[:-3] if filepath.endswith('.gz') else filepath
+    if not base.endswith(('.txt', '.csv')):
         raise ValueError('Desteklenmeyen dosya formatı!')
-    return texts
+    if filepath.endswith('.gz'):
+        f = gzip.open(filepath, 'rt', encoding=encoding, newline='')
+    else:
+        f = open(filepath, encoding=encoding, newline='')
+    with f:
+        if base.endswith('.txt'):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+            return
+        reader = csv.reader(f)
+        indices = None
+        if columns is not None:
+            if any(isinstance(c, str) for c in columns):
+                header = next(reader, [])
+                try:
+                    indices = [c if isinstance(c, int) else header.index(c) for c in columns]
+                except ValueError as e:
+                    raise ValueError(f'CSV başlığında sütun bulunamadı: {e}')
+            else:
+                indices = list(columns)
+        for row in reader:
+            cells = row if indices is None else [row[i] for i in indices if i < len(row)]
+            for cell in cells:
+                cell = cell.strip()
+                if cell:
+                    yield cell
+
+def read_texts_from_file(filepath, columns=None, encoding='utf-8'):
+    """txt veya csv dosyasından metinleri liste olarak okur."""
+    return list(iter_texts_from_file(filepath, columns=columns, encoding=encoding))
 
 # ----------------------
-# Dinamik Ön İşleme Pipeline'ı
+# Dil kaynakları (süreç başına bir kez yüklenir)
+# ----------------------
+_stopword_sets = {}
+
+def _get_stopwords(language):
+    """Stopword kümesini dil başına bir kez oluşturur."""
+    sw = _stopword_sets.get(language)
+    if sw is None:
+        from nltk.corpus import stopwords
+        try:
+            sw = set(stopwords.words(language))
+        except:
+            sw = set()
+        _stopword_sets[language] = sw
+    return sw
+
+_pos_tagger = None
+
+def _get_pos_tagger():
+    """Perceptron tagger'ı süreç başına bir kez yükler (nltk.pos_tag her çağrıda yeniden oluşturur)."""
+    global _pos_tagger
+    if _pos_tagger is None:
+        from nltk.tag import PerceptronTagger
+        _pos_tagger = PerceptronTagger()
+    return _pos_tagger
+
+def _get_wordnet_pos(treebank_tag):
+    """Penn Treebank etiketini WordNet POS koduna çevirir."""
+    if treebank_tag.startswith('J'):
+        return 'a'
+    elif treebank_tag.startswith('V'):
+        return 'v'
+    elif treebank_tag.startswith('N'):
+        return 'n'
+    elif treebank_tag.startswith('R'):
+        return 'r'
+    else:
+        return 'n'
+
+# ----------------------
+# Derlenmiş Ön İşleme Pipeline'ı
+# ----------------------
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_DIGIT_RE = re.compile(r'\d+')
+
+class Pipeline:
+    """
+    Yapılandırmadan bir kez kurulan, tekrar kullanılabilir ön işleme pipeline'ı.
+    Dil kaynakları (stopword kümesi, tagger, WordNet), regex'ler ve seçilen
+    adımlar kurulumda çözülür; process/process_one çağrıları yalnızca işi yapar.
+    """
+
+    def __init__(
+        self,
+        language='english',
+        do_tokenize=True,
+        do_lowercase=True,
+        remove_stopwords=True,
+        do_lemmatization=True,
+        use_pos_tagging=True,
+        lemma_cache=None,
+        spacy_batch_size=1000,
+        spacy_n_process=1
+    ):
+        check_language(language)
+        self.language = language
+        self.do_tokenize = do_tokenize
+        self.do_lowercase = do_lowercase
+        self.remove_stopwords = remove_stopwords
+        self.do_lemmatization = do_lemmatization
+        self.use_pos_tagging = use_pos_tagging
+        self.lemma_cache = wordnet_cache if lemma_cache is None else lemma_cache
+        self.spacy_batch_size = spacy_batch_size
+        self.spacy_n_process = spacy_n_process
+
+        # Seçilen adımların ihtiyaç duyduğu NLTK verileri yoksa hemen hata ver
+        required = []
+        if do_tokenize:
+            required.append('punkt')
+        if remove_stopwords:
+            required.append('stopwords')
+        if do_lemmatization and language == 'english':
+            required.append('wordnet')
+            if use_pos_tagging:
+                required.append('averaged_perceptron_tagger')
+        check_nltk_resources(required)
+
+        self._nlp_tr = _get_nlp_tr() if do_lemmatization and language == 'turkish' else None
+        if do_lemmatization and language == 'turkish' and self._nlp_tr is None:
+            warnings.warn("Türkçe lemmatization için spaCy gerekli!")
+
+        # Metin düzeyindeki adımlar
+        self._text_steps = [str.lower] if do_lowercase else []
+        self._text_steps.append(lambda text: _PUNCT_RE.sub('', text))
+        self._text_steps.append(lambda text: _DIGIT_RE.sub(' ', text))
+
+        # Tokenization
+        if do_tokenize:
+            from nltk.tokenize import word_tokenize
+            tokenizer_language = 'turkish' if language == 'turkish' else 'english'
+            self._tokenize = lambda text: word_tokenize(text, language=tokenizer_language)
+        else:
+            self._tokenize = str.split
+
+        # Stopword kümesi
+        self._stopwords = _get_stopwords(language) if remove_stopwords else None
+
+        # Lemmatization (belge grubu üzerinde çalışır)
+        self._lemmatize = None
+        if do_lemmatization:
+            if language == 'english':
+                from nltk.corpus import wordnet
+                wordnet.ensure_loaded()
+                if use_pos_tagging:
+                    self._tagger = _get_pos_tagger()
+                    self._lemmatize = self._lemmatize_tagged
+                else:
+                    self._lemmatize = self._lemmatize_plain
+            elif language == 'turkish' and self._nlp_tr is not None:
+                self._lemmatize = self._lemmatize_turkish
+
+    @property
+    def config(self):
+        """Pipeline'ı yeniden kurmaya yetecek yapılandırma (ör. işçi süreçler için)."""
+        return {
+            'language': self.language,
+            'do_tokenize': self.do_tokenize,
+            'do_lowercase': self.do_lowercase,
+            'remove_stopwords': self.remove_stopwords,
+            'do_lemmatization': self.do_lemmatization,
+            'use_pos_tagging': self.use_pos_tagging,
+            'spacy_batch_size': self.spacy_batch_size,
+            'spacy_n_process': self.spacy_n_process
+        }
+
+    def _lemmatize_tagged(self, token_lists, timer=metrics.NULL_TIMER):
+        # Tüm belgeler tek bir tagger örneğiyle toplu olarak etiketlenir
+        tagged_lists = self._tagger.tag_sents(token_lists)
+        timer.lap('pos_tagging')
+        cache = self.lemma_cache
+        return [
+            [wordnet_lemmatize(w, _get_wordnet_pos(p), cache) for w, p in tagged]
+            for tagged in tagged_lists
+        ]
+
+    def _lemmatize_plain(self, token_lists, timer=metrics.NULL_TIMER):
+        cache = self.lemma_cache
+        return [[wordnet_lemmatize(w, 'n', cache) for w in tokens] for tokens in token_lists]
+
+    def _lemmatize_turkish(self, token_lists, timer=metrics.NULL_TIMER):
+        # Doc'lar mevcut tokenlardan kurulur (metin birleştirilip yeniden ayrıştırılmaz)
+        # ve nlp.pipe ile gruplar halinde işlenir
+        from spacy.tokens import Doc
+        nlp = self._nlp_tr
+        docs = (Doc(nlp.vocab, words=tokens) for tokens in token_lists)
+        return [
+            [token.lemma_ or token.text for token in doc]
+            for doc in nlp.pipe(docs, batch_size=self.spacy_batch_size, n_process=self.spacy_n_process)
+        ]
+
+    def _tokenize_and_filter(self, text, timer=metrics.NULL_TIMER):
+        orig_len = len(text.split())
+        for step in self._text_steps:
+            text = step(text)
+        timer.lap('clean')
+        tokens = self._tokenize(text)
+        timer.lap('tokenize', len(tokens))
+        stopword_count = 0
+        if self._stopwords is not None:
+            sw = self._stopwords
+            kept = [t for t in tokens if t not in sw]
+            stopword_count = len(tokens) - len(kept)
+            tokens = kept
+            timer.lap('stopwords', len(tokens))
+        return tokens, {
+            'original_word_count': orig_len,
+            'stopwords_removed': stopword_count
+        }
+
+    def process(self, texts, workers=1, chunksize=None, dedup=False, output='text', vocabulary=None, executor=None):
+        """
+        texts: list of str
+        workers: 1'den büyükse metinler süreç havuzuna parçalar halinde dağıtılır
+        chunksize: işçi başına gönderilen metin sayısı (varsayılan: otomatik)
+        dedup: True ise normalize edilmiş hali aynı olan metinler bir kez işlenir
+        output: 'text' (boşlukla birleştirilmiş string'ler) veya 'ids' (EncodedCorpus: int32 token id'leri)
+        vocabulary: output='ids' için kullanılacak Vocabulary (ör. gruplar arasında id'leri sabit tutmak için)
+        executor: workers > 1 iken kullanılacak, worker_pool(self.config, workers) ile açılmış havuz;
+                  verilmezse çağrı başına yeni bir havuz açılıp kapatılır
+        Returns: dict with processed_texts, stats (girdi sırasıyla);
+                 dedup=True ise ayrıca duplicate_ratio
+        """
+        if dedup:
+            unique_texts, positions = dedup_texts(texts, lowercase=self.do_lowercase)
+            result = self.process(unique_texts, workers=workers, chunksize=chunksize,
+                                  output=output, vocabulary=vocabulary, executor=executor)
+            processed_texts, stats = fan_out(result['processed_texts'], result['stats'], positions)
+            return {
+                'processed_texts': processed_texts,
+                'stats': stats,
+                'duplicate_ratio': duplicate_ratio(unique_texts, positions)
+            }
+        # Ölçüm açıksa (metrics.enable) aşama süreleri ve token sayıları kaydedilir
+        timer = metrics.stage_timer('main')
+        if workers > 1:
+            # Generator da gelebilir; parçalara bölmek için liste gerekir
+            texts = list(texts)
+        if workers > 1 and len(texts) > 1:
+            # İşçi süreçlerin aşama süreleri bu sürece taşınmaz; yalnızca toplam süre kaydedilir
+            result = _preprocess_parallel(texts, self.config, workers, chunksize, executor)
+            timer.lap('parallel', sum(stat['final_word_count'] for stat in result['stats']))
+            timer.flush(len(result['stats']))
+            if output == 'ids':
+                # İşçilerden string olarak gelen sonuçlar burada id'lere çevrilir
+                corpus = EncodedCorpus(vocabulary)
+                for text in result['processed_texts']:
+                    corpus.append(text.split())
+                result['processed_texts'] = corpus
+            return result
+        token_lists = []
+        stats = []
+        for text in texts:
+            tokens, stat = self._tokenize_and_filter(text, timer)
+            token_lists.append(tokens)
+            stats.append(stat)
+        if self._lemmatize is not None:
+            timer.start()
+            token_lists = self._lemmatize(token_lists, timer)
+            timer.lap('lemmatize', sum(len(tokens) for tokens in token_lists) if metrics.enabled() else None)
+        # ids modunda tokenlar string'e birleştirilmeden doğrudan id dizisine eklenir
+        processed_texts = EncodedCorpus(vocabulary) if output == 'ids' else []
+        for tokens, stat in zip(token_lists, stats):
+            processed_texts.append(tokens if output == 'ids' else ' '.join(tokens))
+            stat['final_word_count'] = len(tokens)
+        timer.flush(len(stats))
+        return {'processed_texts': processed_texts, 'stats': stats}
+
+    def process_one(self, text):
+        """Tek bir metni işler. Returns: (processed_text, stat)"""
+        result = self.process([text])
+        return result['processed_texts'][0], result['stats'][0]
+
+_pipelines = {}
+_pipelines_lock = threading.Lock()
+
+def get_pipeline(
+    language='english',
+    do_tokenize=True,
+    do_lowercase=True,
+    remove_stopwords=True,
+    do_lemmatization=True,
+    use_pos_tagging=True,
+    lemma_cache=None,
+    spacy_batch_size=1000,
+    spacy_n_process=1
+):
+    """Aynı yapılandırma için tek bir Pipeline örneği döndürür (web uygulamaları için)."""
+    key = (language, do_tokenize, do_lowercase, remove_stopwords, do_lemmatization, use_pos_tagging, lemma_cache,
+           spacy_batch_size, spacy_n_process)
+    pipeline = _pipelines.get(key)
+    if pipeline is None:
+        with _pipelines_lock:
+            pipeline = _pipelines.get(key)
+            if pipeline is None:
+                pipeline = Pipeline(*key)
+                _pipelines[key] = pipeline
+    return pipeline
+
+_WARMUP_TEXTS = {
+    'english': ["The quick brown foxes were running over the lazy dogs."],
+    'turkish': ["Hızlı kahverengi tilkiler tembel köpeklerin üzerinden atlıyordu."]
+}
+
+def warm_up(languages=('english', 'turkish'), vectorize=True):
+    """
+    Dil kaynaklarını (stopword'ler, WordNet, tagger, spaCy) önceden yükler ve
+    varsayılan Pipeline'ları örnek bir metinle çalıştırarak ilk istekteki gecikmeyi önler.
+    Eksik NLTK verisi varsa LookupError fırlatır.
+    """
+    for language in languages:
+        pipeline = get_pipeline(language=language)
+        processed = pipeline.process(_WARMUP_TEXTS.get(language, _WARMUP_TEXTS['english']))
+        if vectorize:
+            vectorize_texts(processed['processed_texts'], method='tfidf', sparse=True)
+
+# ----------------------
+# Dinamik Ön İşleme Fonksiyonları
 # ----------------------
 def preprocess_texts(
     texts,
@@ -69,100 +415,569 @@ def preprocess_texts(
     do_lowercase=True,
     remove_stopwords=True,
     do_lemmatization=True,
-    use_pos_tagging=True
+    use_pos_tagging=True,
+    lemma_cache=None,
+    workers=1,
+    chunksize=None,
+    spacy_batch_size=1000,
+    spacy_n_process=1,
+    dedup=False,
+    output='text'
 ):
     """
     texts: list of str
     language: 'english' or 'turkish'
-    Returns: dict with processed_texts, stats
+    lemma_cache: LemmaCache (varsayılan: süreç boyunca paylaşılan wordnet_cache)
+    spacy_batch_size, spacy_n_process: Türkçe lemmatization'da nlp.pipe grup boyutu ve süreç sayısı
+    workers: 1'den büyükse metinler süreç havuzuna parçalar halinde dağıtılır
+    chunksize: işçi başına gönderilen metin sayısı (varsayılan: otomatik)
+    dedup: True ise aynı metinler bir kez işlenip sonuçlar tüm kopyalara dağıtılır
+    output: 'ids' ise processed_texts bir EncodedCorpus'tur; vektörleştiriciler onu doğrudan kullanır
+    Returns: dict with processed_texts, stats (girdi sırasıyla); dedup=True ise ayrıca duplicate_ratio
     """
-    stats = []
+    pipeline = get_pipeline(
+        language=language,
+        do_tokenize=do_tokenize,
+        do_lowercase=do_lowercase,
+        remove_stopwords=remove_stopwords,
+        do_lemmatization=do_lemmatization,
+        use_pos_tagging=use_pos_tagging,
+        lemma_cache=lemma_cache,
+        spacy_batch_size=spacy_batch_size,
+        spacy_n_process=spacy_n_process
+    )
+    return pipeline.process(texts, workers=workers, chunksize=chunksize, dedup=dedup, output=output)
+
+def preprocess_texts_iter(texts, batch_size=1000, dedup=False, **options):
+    """
+    preprocess_texts'in üreteç (generator) sürümü.
+    texts: herhangi bir iterable (ör. iter_texts_from_file çıktısı)
+    Metinler batch_size'lık gruplar halinde işlenir; bellekte yalnızca bir grup tutulur.
+    dedup: True ise her grup içindeki tekrar eden metinler bir kez işlenir
+    Yields: (processed_text, stat)
+    """
+    pipeline = get_pipeline(**options)
+    iterator = iter(texts)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        result = pipeline.process(batch, dedup=dedup)
+        yield from zip(result['processed_texts'], result['stats'])
+
+# ----------------------
+# Kalıcı ön işleme önbelleği (memory-mapped)
+# ----------------------
+CORPUS_CACHE_DIR = os.environ.get('NLPLAY_CORPUS_CACHE_DIR', 'corpus_cache')
+
+def preprocess_texts_cached(texts, cache_dir=None, fingerprint=None, batch_size=10000,
+                            workers=1, chunksize=None, dedup=False, **options):
+    """
+    preprocess_texts(..., output='ids') + kalıcı disk önbelleği (bkz. corpus_cache).
+    Aynı korpus ve aynı ön işleme ayarlarıyla sonraki çağrılar sonucu diskten,
+    memory-mapped olarak açar; tokenization ve lemmatization tekrarlanmaz.
+    cache_dir: önbellek dizini (varsayılan: NLPLAY_CORPUS_CACHE_DIR veya 'corpus_cache')
+    fingerprint: korpus parmak izi; verilmezse metinlerden hesaplanır (texts iki kez okunur).
+                 Büyük dosyalar için corpus_cache.file_fingerprint(dosya, columns, encoding) verilebilir;
+                 columns/encoding iter_texts_from_file'a verilenlerle aynı olmalıdır.
+    batch_size: ıskada metinler bu boyutta gruplar halinde işlenip diske eklenir
+    Returns: dict with processed_texts (EncodedCorpus), stats, cache_hit
+    """
+    from corpus_cache import CorpusCache, corpus_fingerprint, corpus_key
+    pipeline = get_pipeline(**options)
+    if fingerprint is None:
+        if not isinstance(texts, (list, tuple)):
+            texts = list(texts)
+        fingerprint = corpus_fingerprint(texts)
+    cache = CorpusCache(cache_dir or CORPUS_CACHE_DIR)
+    key = corpus_key(fingerprint, pipeline.config)
+    entry = cache.get(key)
+    cache_hit = entry is not None
+    if not cache_hit:
+        writer = cache.writer(key)
+        # Tüm gruplar aynı süreç havuzuna gönderilir; işçiler ve dil kaynakları bir kez yüklenir
+        executor = worker_pool(pipeline.config, workers) if workers > 1 else None
+        try:
+            iterator = iter(texts)
+            while True:
+                batch = list(islice(iterator, batch_size))
+                if not batch:
+                    break
+                result = pipeline.process(batch, workers=workers, chunksize=chunksize, dedup=dedup,
+                                          output='ids', vocabulary=writer.vocabulary, executor=executor)
+                writer.write(result['processed_texts'], result['stats'])
+            writer.commit({'fingerprint': fingerprint, 'config': pipeline.config})
+        except BaseException:
+            writer.abort()
+            raise
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        entry = cache.get(key)
+    corpus, stats, _ = entry
+    return {'processed_texts': corpus, 'stats': stats, 'cache_hit': cache_hit}
+
+# ----------------------
+# Paralel Ön İşleme (süreç havuzu)
+# ----------------------
+_worker_pipeline = None
+
+def _init_worker(config):
+    """Her işçi süreçte bir kez çalışır; Pipeline ve dil kaynaklarını yükler."""
+    global _worker_pipeline
+    _worker_pipeline = Pipeline(**config)
+
+def _preprocess_chunk(chunk):
+    """İşçi süreçte bir parça metni işler."""
+    return _worker_pipeline.process(chunk)
+
+def worker_pool(config, workers):
+    """
+    config (Pipeline.config) için işçi süreç havuzu. Birden fazla process çağrısında
+    (ör. gruplar halinde ön işleme) executor= ile paylaşılır; işi biten çağıran shutdown() eder.
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config,))
+
+def _preprocess_parallel(texts, config, workers, chunksize=None, executor=None):
+    """Metinleri parçalara bölüp süreç havuzunda işler; sıra korunur."""
+    texts = list(texts)
+    if chunksize is None:
+        # İşçi başına birkaç parça: yük dengesi ile iletişim maliyeti arasında denge
+        chunksize = max(1, math.ceil(len(texts) / (workers * 4)))
+    chunks = [texts[i:i + chunksize] for i in range(0, len(texts), chunksize)]
     processed_texts = []
-    if language == 'turkish' and nlp_tr is None:
-        warnings.warn("Türkçe lemmatization için spaCy gerekli!")
-    lemmatizer = WordNetLemmatizer()
-    for text in texts:
-        orig_len = len(text.split())
-        # Lowercase
-        if do_lowercase:
-            text = text.lower()
-        # Remove punctuation and numbers
-        text = re.sub(r'[^\w\s]', '', text)
-        text = re.sub(r'\d+', ' ', text)
-        # Tokenize
-        if do_tokenize:
-            tokens = word_tokenize(text, language='turkish' if language=='turkish' else 'english')
-        else:
-            tokens = text.split()
-        # Remove stopwords
-        stopword_count = 0
-        if remove_stopwords:
-            try:
-                sw = set(stopwords.words(language))
-            except:
-                sw = set()
-            tokens_ = []
-            for t in tokens:
-                if t not in sw:
-                    tokens_.append(t)
-                else:
-                    stopword_count += 1
-            tokens = tokens_
-        # Lemmatization
-        if do_lemmatization:
-            if language == 'english':
-                if use_pos_tagging:
-                    from nltk import pos_tag
-                    def get_wordnet_pos(treebank_tag):
-                        if treebank_tag.startswith('J'):
-                            return 'a'
-                        elif treebank_tag.startswith('V'):
-                            return 'v'
-                        elif treebank_tag.startswith('N'):
-                            return 'n'
-                        elif treebank_tag.startswith('R'):
-                            return 'r'
-                        else:
-                            return 'n'
-                    pos_tags = pos_tag(tokens)
-                    tokens = [lemmatizer.lemmatize(w, get_wordnet_pos(p)) for w, p in pos_tags]
-                else:
-                    tokens = [lemmatizer.lemmatize(w) for w in tokens]
-            elif language == 'turkish' and nlp_tr is not None:
-                doc = nlp_tr(' '.join(tokens))
-                tokens = [token.lemma_ for token in doc]
-        processed_texts.append(' '.join(tokens))
-        stats.append({
-            'original_word_count': orig_len,
-            'stopwords_removed': stopword_count,
-            'final_word_count': len(tokens)
-        })
+    stats = []
+    own_executor = executor is None
+    if own_executor:
+        executor = worker_pool(config, min(workers, len(chunks)))
+    try:
+        # map sonuçları gönderim sırasıyla döndürür
+        for result in executor.map(_preprocess_chunk, chunks):
+            processed_texts.extend(result['processed_texts'])
+            stats.extend(result['stats'])
+    finally:
+        if own_executor:
+            executor.shutdown()
     return {'processed_texts': processed_texts, 'stats': stats}
 
 # ----------------------
 # Vektörleştirme Fonksiyonu
 # ----------------------
-def vectorize_texts(texts, method='tfidf', max_features=30):
+def _make_vectorizer(method='tfidf', max_features=30, dtype=None):
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+    options = {'max_features': max_features}
+    if dtype is not None:
+        options['dtype'] = dtype
+    if method == 'tfidf':
+        return TfidfVectorizer(**options)
+    elif method == 'count':
+        return CountVectorizer(**options)
+    raise ValueError('method tfidf, count veya hashing olmalı!')
+
+def vectorize_texts(texts, method='tfidf', max_features=30, sparse=False, dtype=None,
+                    n_features=2**18, use_idf=False, ngram_range=(1, 1), min_df=1, max_df=1.0,
+                    max_vocabulary=None, report=False):
+    """
+    method: 'tfidf' | 'count' | 'hashing'
+    sparse: True ise matris yoğun (dense) diziye çevrilmeden CSR olarak döner
+    dtype: matris veri tipi (ör. np.float32; bellek kullanımını yarıya indirir)
+    n_features, use_idf: yalnızca 'hashing' için (bkz. hashing_vectorize_chunks)
+    ngram_range: (min_n, max_n) kelime n-gram aralığı; (1, 2) unigram + bigram
+    min_df, max_df: belge frekansı sınırları (int: belge sayısı, float: oran; sklearn ile aynı anlam)
+    max_vocabulary: sayım sırasında tutulacak en fazla terim sayısı (bellek sınırı);
+                    aşıldığında belge frekansı en düşük terimler atılır (bkz. _vectorize_pruned)
+    report: True ise ayrıca budama raporu döner (kaç terimin hangi nedenle atıldığı)
+    texts bir EncodedCorpus ise (output='ids') metinler yeniden tokenize edilmez.
+    Returns: feature_names, matrix (report=True ise feature_names, matrix, report)
     """
-    method: 'tfidf' | 'count'
-    Returns: feature_names, matrix
+    timer = metrics.stage_timer('main')
+    ngram_range = tuple(ngram_range)
+    pruning = (ngram_range != (1, 1) or max_vocabulary is not None
+               or not _default_df(min_df, max_df))
+    prune_report = None
+    if method == 'hashing':
+        if max_vocabulary is not None or not _default_df(min_df, max_df):
+            raise ValueError('hashing yönteminde sözlük yoktur; min_df, max_df ve max_vocabulary kullanılamaz')
+        feature_names, X = hashing_vectorize_chunks([texts], n_features=n_features, use_idf=use_idf,
+                                                    dtype=dtype, ngram_range=ngram_range)
+        prune_report = _prune_report(X.shape[0], ngram_range, n_features)
+    elif pruning or report:
+        feature_names, X, prune_report = _vectorize_pruned(
+            texts, method, max_features, dtype, ngram_range, min_df, max_df, max_vocabulary)
+    elif isinstance(texts, EncodedCorpus):
+        feature_names, X = _vectorize_ids(texts, method, max_features, dtype)
+    else:
+        vectorizer = _make_vectorizer(method, max_features, dtype)
+        X = vectorizer.fit_transform(texts)
+        feature_names = vectorizer.get_feature_names_out()
+    timer.lap(f'vectorize_{method}', X.nnz)
+    timer.flush()
+    X = X.tocsr() if sparse else X.toarray()
+    if report:
+        return feature_names, X, prune_report
+    return feature_names, X
+
+def _vocabulary_features(corpus, analyze):
+    """
+    Sözlükteki her terimi (token başına değil, terim başına bir kez) analyzer'dan geçirir.
+    Returns: özellik adları (alfabetik), sözlük x özellik eşleme matrisi
+    """
+    import numpy as np
+    from scipy import sparse
+    features = {}
+    rows = []
+    cols = []
+    for term_id, term in enumerate(corpus.vocabulary.terms):
+        for feature in analyze(term):
+            rows.append(term_id)
+            cols.append(features.setdefault(feature, len(features)))
+    names = sorted(features)
+    column = np.empty(len(names), dtype=np.int64)
+    for j, name in enumerate(names):
+        column[features[name]] = j
+    mapping = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int64), (np.asarray(rows, dtype=np.int64), column[np.asarray(cols, dtype=np.int64)])),
+        shape=(len(corpus.vocabulary), len(names))
+    )
+    return np.asarray(names, dtype=object), mapping
+
+def _vectorize_ids(corpus, method, max_features, dtype):
+    """
+    EncodedCorpus'u sklearn CountVectorizer/TfidfVectorizer ile aynı sonuca vektörleştirir:
+    belge x sözlük sayımları id'lerden kurulur, sözlük -> özellik eşlemesiyle çarpılır.
+    """
+    vectorizer = _make_vectorizer(method, max_features, dtype)
+    feature_names, mapping = _vocabulary_features(corpus, vectorizer.build_analyzer())
+    if not len(feature_names):
+        raise ValueError('empty vocabulary; perhaps the documents only contain stop words')
+    X = (corpus.count_matrix() @ mapping).tocsr()
+    feature_names, X = _limit_features(feature_names, X, max_features)
+    return feature_names, _weight_counts(X, method, dtype)
+
+def _limit_features(feature_names, X, max_features):
+    """
+    sklearn ile aynı seçim (eşitlikler dahil): korpus frekansı en yüksek max_features terim,
+    alfabetik sırada. feature_names alfabetik sıralı olmalıdır.
     """
+    import numpy as np
+    if max_features is None or len(feature_names) <= max_features:
+        return feature_names, X
+    term_freqs = np.asarray(X.sum(axis=0)).ravel()
+    keep = np.sort((-term_freqs).argsort()[:max_features])
+    return feature_names[keep], X[:, keep]
+
+def _weight_counts(X, method, dtype):
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfTransformer
     if method == 'tfidf':
-        vectorizer = TfidfVectorizer(max_features=max_features)
-    elif method == 'count':
-        vectorizer = CountVectorizer(max_features=max_features)
+        X = TfidfTransformer().fit_transform(X)
+    return X.astype(dtype or (np.float64 if method == 'tfidf' else np.int64))
+
+# ----------------------
+# N-gram ve belge frekansı budaması (sınırlı bellekli sözlük)
+# ----------------------
+def _default_df(min_df, max_df):
+    # sklearn varsayılanları: min_df=1 (int), max_df=1.0 (float); max_df=1 (int) tek belge demektir
+    return min_df == 1 and isinstance(min_df, numbers.Integral) and max_df == 1.0 and isinstance(max_df, float)
+
+def _prune_report(documents, ngram_range, vocabulary_size):
+    return {
+        'documents': documents,
+        'ngram_range': list(ngram_range),
+        'vocabulary_size': vocabulary_size,
+        'peak_vocabulary': vocabulary_size,
+        'pruned_memory': 0,
+        'pruned_min_df': 0,
+        'pruned_max_df': 0,
+        'pruned_max_features': 0,
+        'pruned_total': 0
+    }
+
+def _word_ngrams(tokens, min_n, max_n):
+    """sklearn _word_ngrams ile aynı: n-gramlar tokenların boşlukla birleştirilmesidir."""
+    if max_n == 1:
+        return tokens
+    ngrams = list(tokens) if min_n == 1 else []
+    for n in range(max(min_n, 2), max_n + 1):
+        ngrams.extend(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return ngrams
+
+def _iter_analyzed(texts, tokenize):
+    """Her belge için sklearn analyzer'ının unigram tokenları (EncodedCorpus'ta terim başına bir kez)."""
+    if isinstance(texts, EncodedCorpus):
+        term_tokens = [tokenize(term) for term in texts.vocabulary.terms]
+        for ids in texts:
+            yield [token for i in ids for token in term_tokens[i]]
     else:
-        raise ValueError('method tfidf veya count olmalı!')
-    X = vectorizer.fit_transform(texts)
-    return vectorizer.get_feature_names_out(), X.toarray()
+        for text in texts:
+            yield tokenize(text)
+
+def _vectorize_pruned(texts, method, max_features, dtype, ngram_range, min_df, max_df, max_vocabulary):
+    """
+    İki geçişli, bellek sınırlı vektörleştirme (sklearn CountVectorizer/TfidfVectorizer ile aynı anlam):
+    1. geçiş: yalnızca belge frekansları sayılır. Sözlük max_vocabulary'yi aştığında belge frekansı
+       eşiğin altındaki terimler atılarak sınırın yarısına inilir; sözlük hiçbir an sınırı
+       (bir belgenin terimleri kadar fazlasıyla) geçmez. Budama maliyeti sınırın yarısı kadar yeni
+       terime yayılır. Eşik (min_reduce) her budamada yükselir ve geri inmez (gensim ile aynı yöntem):
+       eski terimler yüksek sayımlarıyla sözlüğü kilitlemez, sonradan sık görülmeye başlayan terimler
+       de yer bulur. Atılan terim sonra tekrar görülürse sıfırdan sayılır, bu yüzden sınır
+       devredeyken belge frekansları alt sınırdır.
+    2. geçiş: yalnızca min_df/max_df'ten geçen terimler sayılarak CSR matris kurulur,
+       max_features seçimi kesin terim frekanslarıyla yapılır.
+    max_vocabulary=None ise sonuç sklearn ile birebir aynıdır.
+    Rapor: pruned_memory (sayım sırasında atılan terimler; tekrar görülüp yeniden atılanlar her seferinde
+    sayılır), pruned_min_df, pruned_max_df, pruned_max_features, peak_vocabulary (en büyük sözlük boyutu)
+    Returns: feature_names, CSR matris, budama raporu
+    """
+    import numpy as np
+    from array import array
+    from scipy import sparse
+    from sklearn.feature_extraction.text import CountVectorizer
+    min_n, max_n = ngram_range
+    if not 1 <= min_n <= max_n:
+        raise ValueError(f'Geçersiz ngram_range: {ngram_range}')
+    if max_vocabulary is not None and max_vocabulary < 1:
+        raise ValueError('max_vocabulary en az 1 olmalı')
+    if method not in ('tfidf', 'count'):
+        raise ValueError('method tfidf, count veya hashing olmalı!')
+    tokenize = CountVectorizer().build_analyzer()
+
+    # 1. geçiş: belge frekansları
+    df = {}
+    n_docs = 0
+    peak = 0
+    pruned_memory = 0
+    min_reduce = 1
+    target = max_vocabulary // 2 if max_vocabulary is not None else None
+    for tokens in _iter_analyzed(texts, tokenize):
+        n_docs += 1
+        for term in set(_word_ngrams(tokens, min_n, max_n)):
+            df[term] = df.get(term, 0) + 1
+        if max_vocabulary is not None and len(df) > max_vocabulary:
+            peak = max(peak, len(df))
+            # Eşik min_reduce'tan başlar, kalan terimler sınırın yarısına inene kadar yükseltilir
+            histogram = Counter(df.values())
+            remaining = len(df) - sum(n for count, n in histogram.items() if count <= min_reduce)
+            threshold = min_reduce
+            while remaining > target:
+                threshold += 1
+                remaining -= histogram.get(threshold, 0)
+            pruned_memory += len(df) - remaining
+            df = {term: count for term, count in df.items() if count > threshold}
+            min_reduce = threshold + 1
+    peak = max(peak, len(df))
+    if not df and not pruned_memory:
+        raise ValueError('empty vocabulary; perhaps the documents only contain stop words')
+
+    # Belge frekansı sınırları (sklearn ile aynı yorum)
+    max_doc_count = max_df if isinstance(max_df, numbers.Integral) else max_df * n_docs
+    min_doc_count = min_df if isinstance(min_df, numbers.Integral) else min_df * n_docs
+    if max_doc_count < min_doc_count:
+        raise ValueError('max_df corresponds to < documents than min_df')
+    pruned_max_df = sum(1 for count in df.values() if count > max_doc_count)
+    pruned_min_df = sum(1 for count in df.values() if count < min_doc_count)
+    kept = sorted(term for term, count in df.items() if min_doc_count <= count <= max_doc_count)
+    if not kept:
+        raise ValueError('After pruning, no terms remain. Try a lower min_df or a higher max_df.')
+    del df
+
+    # 2. geçiş: yalnızca kalan terimler sayılır
+    vocabulary = {term: j for j, term in enumerate(kept)}
+    indices = array('i')
+    values = array('q')
+    indptr = array('q', [0])
+    for tokens in _iter_analyzed(texts, tokenize):
+        counts = {}
+        for term in _word_ngrams(tokens, min_n, max_n):
+            j = vocabulary.get(term)
+            if j is not None:
+                counts[j] = counts.get(j, 0) + 1
+        indices.extend(counts.keys())
+        values.extend(counts.values())
+        indptr.append(len(indices))
+    del vocabulary
+    X = sparse.csr_matrix(
+        (np.array(values, dtype=np.int64), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+        shape=(n_docs, len(kept))
+    )
+    X.sort_indices()
+    feature_names, X = _limit_features(np.asarray(kept, dtype=object), X, max_features)
+
+    prune_report = _prune_report(n_docs, ngram_range, len(feature_names))
+    prune_report.update({
+        'peak_vocabulary': peak,
+        'pruned_memory': pruned_memory,
+        'pruned_min_df': pruned_min_df,
+        'pruned_max_df': pruned_max_df,
+        'pruned_max_features': len(kept) - len(feature_names)
+    })
+    prune_report['pruned_total'] = pruned_memory + pruned_min_df + pruned_max_df + prune_report['pruned_max_features']
+    return feature_names, _weight_counts(X, method, dtype), prune_report
+
+class HashedFeatureNames:
+    """Hashing modunda sütun adları ('hash_<i>'); isim listesi bellekte tutulmaz."""
+
+    def __init__(self, n_features):
+        self.n_features = n_features
+
+    def __len__(self):
+        return self.n_features
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.n_features:
+            raise IndexError(i)
+        return f'hash_{i}'
+
+    def tolist(self):
+        return [self[i] for i in range(self.n_features)]
+
+def hashing_vectorize_chunks(chunks, n_features=2**18, use_idf=False, dtype=None, ngram_range=(1, 1)):
+    """
+    Sözlük tutmadan (hashing trick) vektörleştirme; bellek sözlük boyutundan bağımsızdır.
+    chunks: metin listelerinden veya EncodedCorpus'lardan oluşan iterable
+            (ör. preprocess_texts_iter çıktısından gruplar)
+    use_idf: True ise belge frekansları parçalar boyunca biriktirilir ve
+             sonuç TF-IDF (l2 normlu) olarak yeniden ağırlıklandırılır; False ise ham sayımlar döner.
+    ngram_range: (min_n, max_n) kelime n-gram aralığı; n-gramlar da sözlük tutulmadan hash'lenir
+    Returns: feature_names (HashedFeatureNames), CSR matris
+    """
+    import numpy as np
+    from scipy import sparse
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.preprocessing import normalize
+    vectorizer = HashingVectorizer(
+        n_features=n_features,
+        alternate_sign=False,
+        norm=None,
+        dtype=dtype or np.float64,
+        ngram_range=tuple(ngram_range)
+    )
+    parts = []
+    # Belge frekansları yalnızca IDF için tutulur (n_features büyükse dizi de büyüktür)
+    df = np.zeros(n_features, dtype=np.int64) if use_idf else None
+    n_docs = 0
+    for chunk in chunks:
+        if isinstance(chunk, EncodedCorpus) and tuple(ngram_range) != (1, 1):
+            # N-gramlar belge içindeki komşuluğa bağlıdır; terim başına hash'lenemez
+            X = vectorizer.transform(chunk.texts()).tocsr()
+        elif isinstance(chunk, EncodedCorpus):
+            # Yalnızca sözlükteki terimler hash'lenir; belgeler id sayımlarıyla çarpılır
+            X = (chunk.count_matrix() @ vectorizer.transform(chunk.vocabulary.terms)).tocsr()
+            X = X.astype(vectorizer.dtype)
+        else:
+            X = vectorizer.transform(chunk).tocsr()
+        if use_idf:
+            # Her satırda bir sütun en fazla bir kez geçer -> belge frekansı
+            df += np.bincount(X.indices, minlength=n_features)
+            n_docs += X.shape[0]
+        parts.append(X)
+    if not parts:
+        return HashedFeatureNames(n_features), sparse.csr_matrix((0, n_features), dtype=vectorizer.dtype)
+    X = sparse.vstack(parts, format='csr')
+    if use_idf:
+        # sklearn TfidfTransformer ile aynı (smooth_idf=True) formül
+        idf = np.log((1 + n_docs) / (1 + df)) + 1
+        X = normalize(X @ sparse.diags(idf.astype(X.dtype)), norm='l2', copy=False).tocsr()
+    return HashedFeatureNames(n_features), X
+
+# ----------------------
+# Bir kez eğit, çok kez dönüştür (kalıcı sözlük)
+# ----------------------
+def fit_vectorizer(texts, method='tfidf', max_features=30, dtype=None):
+    """Referans korpus üzerinde vektörleştiriciyi eğitir (sözlük + IDF ağırlıkları)."""
+    if method == 'hashing':
+        raise ValueError('fit_vectorizer yalnızca tfidf ve count destekler; hashing eğitilmez')
+    vectorizer = _make_vectorizer(method, max_features, dtype)
+    vectorizer.fit(texts)
+    return vectorizer
+
+def transform_texts(vectorizer, texts, sparse=True):
+    """Eğitilmiş vektörleştirici ile yeni metinleri aynı özellik uzayına dönüştürür."""
+    timer = metrics.stage_timer('main')
+    X = vectorizer.transform(texts)
+    timer.lap('transform', X.nnz)
+    timer.flush()
+    return X.tocsr() if sparse else X.toarray()
+
+def save_vectorizer(vectorizer, path, preprocess_options=None):
+    """
+    Eğitilmiş vektörleştiriciyi .npz olarak kaydeder (pickle kullanılmaz).
+    Sözlük sütun sırasıyla bir string dizisi, IDF ağırlıkları float dizisi olarak saklanır.
+    preprocess_options: yeni metinlerin aynı şekilde ön işlenmesi için Pipeline yapılandırması
+    """
+    import json
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    method = 'tfidf' if isinstance(vectorizer, TfidfVectorizer) else 'count'
+    meta = {
+        'method': method,
+        'max_features': vectorizer.max_features,
+        'dtype': np.dtype(vectorizer.dtype).name,
+        'preprocess_options': preprocess_options or {}
+    }
+    arrays = {
+        'vocabulary': np.asarray(vectorizer.get_feature_names_out(), dtype=str),
+        'meta': np.asarray(json.dumps(meta))
+    }
+    if method == 'tfidf':
+        arrays['idf'] = vectorizer.idf_
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+def load_vectorizer(path):
+    """
+    save_vectorizer ile kaydedilen modeli yükler; yeniden eğitim yapılmaz.
+    Returns: vectorizer, preprocess_options
+    """
+    import json
+    import numpy as np
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+    with np.load(path, allow_pickle=False) as f:
+        vocabulary = f['vocabulary'].tolist()
+        meta = json.loads(f['meta'].item())
+        idf = f['idf'] if 'idf' in f else None
+    options = {'vocabulary': vocabulary, 'dtype': np.dtype(meta['dtype'])}
+    if meta['method'] == 'tfidf':
+        vectorizer = TfidfVectorizer(**options)
+        vectorizer.idf_ = idf
+    else:
+        vectorizer = CountVectorizer(**options)
+    return vectorizer, meta['preprocess_options']
+
+def column_sums(matrix):
+    """Dense veya sparse matris için sütun toplamlarını 1 boyutlu dizi olarak döndürür."""
+    import numpy as np
+    return np.asarray(matrix.sum(axis=0)).ravel()
 
 # ----------------------
 # Görselleştirme Fonksiyonları
 # ----------------------
-def plot_wordcloud(texts, title='Word Cloud'):
-    """WordCloud görselleştirmesi."""
-    text = ' '.join(texts)
-    wc = WordCloud(width=800, height=400, background_color='white').generate(text)
+# WordCloud'a verilen en fazla terim sayısı (WordCloud'un varsayılan max_words değeri)
+WORDCLOUD_TOP_K = 200
+
+def term_frequencies(texts, top_k=WORDCLOUD_TOP_K):
+    """
+    İşlenmiş metinlerdeki terim frekansları: {terim: adet}, en sık top_k terim (None: hepsi).
+    Metinler tek bir büyük string'de birleştirilmeden, belge belge sayılır;
+    EncodedCorpus verilirse id'ler doğrudan sayılır.
+    """
+    if isinstance(texts, EncodedCorpus):
+        terms = texts.vocabulary.terms
+        counts = Counter({terms[i]: n for i, n in enumerate(texts.term_counts()) if n})
+        return dict(counts.most_common(top_k))
+    counts = Counter()
+    for text in texts:
+        counts.update(text.split())
+    return dict(counts.most_common(top_k))
+
+def plot_wordcloud(texts, title='Word Cloud', frequencies=None, top_k=WORDCLOUD_TOP_K):
+    """WordCloud görselleştirmesi; frequencies verilirse metinler yeniden sayılmaz."""
+    import matplotlib.pyplot as plt
+    from wordcloud import WordCloud
+    if frequencies is None:
+        frequencies = term_frequencies(texts, top_k)
+    wc = WordCloud(width=800, height=400, background_color='white', max_words=top_k)
+    wc.generate_from_frequencies(frequencies)
     plt.figure(figsize=(10,5))
     plt.imshow(wc, interpolation='bilinear')
     plt.axis('off')
@@ -172,7 +987,8 @@ def plot_wordcloud(texts, title='Word Cloud'):
 def plot_top_words_bar(feature_names, matrix, top_n=10, title='En Sık Kelimeler'):
     """Bar chart ile en yüksek ağırlıklı kelimeler."""
     import numpy as np
-    word_scores = matrix.sum(axis=0)
+    import matplotlib.pyplot as plt
+    word_scores = column_sums(matrix)
     top_idx = np.argsort(word_scores)[::-1][:top_n]
     plt.figure(figsize=(10,5))
     plt.bar([feature_names[i] for i in top_idx], word_scores[top_idx])
@@ -228,8 +1044,7 @@ if __name__ == '__main__':
     print("✓ Stopword temizliği")
     print("✓ Lemmatization (POS tagging ile)")
     
-    result = preprocess_texts(
-        corpus,
+    options = dict(
         language='english',
         do_tokenize=True,
         do_lowercase=True,
@@ -237,12 +1052,18 @@ if __name__ == '__main__':
         do_lemmatization=True,
         use_pos_tagging=True
     )
+    if '--cache' in sys.argv:
+        # Ön işleme sonucu CORPUS_CACHE_DIR'e yazılır; sonraki çalıştırmalar diskten açar
+        result = preprocess_texts_cached(corpus, **options)
+        print(f"Önbellek: {'isabet' if result['cache_hit'] else 'ıska'} ({CORPUS_CACHE_DIR})")
+    else:
+        result = preprocess_texts(corpus, **options)
     processed = result['processed_texts']
     stats = result['stats']
 
     print(f"\n3. İŞLENMİŞ METİNLER:")
     print("-" * 40)
-    for i, text in enumerate(processed, 1):
+    for i, text in enumerate(processed.texts() if isinstance(processed, EncodedCorpus) else processed, 1):
         print(f"{i}. {text}")
 
     # 3. İstatistiksel özet ve uyarılar
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Matris Dışa Aktarma
+- CSV: satır satır üretilir (akış halinde gönderilebilir, dense kopya oluşmaz)
+- Sparse .npz (scipy), Matrix Market (.mtx) ve Parquet (sütunlu, pyarrow gerekir)
+- İkili formatlar sözlük dosyasıyla (vocabulary.txt) birlikte tek bir zip içinde paketlenir
+"""
+
+import io
+import csv
+import zipfile
+
+import numpy as np
+from scipy import sparse
+
+EXPORT_FORMATS = ('csv', 'npz', 'mtx', 'parquet')
+
+
+def iter_csv_rows(matrix, feature_names, row_prefix='Metin'):
+    """Başlık + her belge için bir CSV satırı (str) üretir; aynı anda yalnızca bir satır açılır."""
+    matrix = sparse.csr_matrix(matrix)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow([''] + list(feature_names))
+    yield flush()
+    row = np.zeros(matrix.shape[1], dtype=matrix.dtype)
+    for i in range(matrix.shape[0]):
+        start, end = matrix.indptr[i], matrix.indptr[i + 1]
+        row[:] = 0
+        row[matrix.indices[start:end]] = matrix.data[start:end]
+        # astype(str) değerleri matrisin kendi hassasiyetinde yazar (float32 için float64 repr'i değil)
+        writer.writerow([f'{row_prefix}_{i+1}'] + row.astype(str).tolist())
+        yield flush()
+
+
+def _npz_bytes(matrix):
+    buffer = io.BytesIO()
+    sparse.save_npz(buffer, sparse.csr_matrix(matrix))
+    return buffer.getvalue()
+
+
+def _mtx_bytes(matrix):
+    from scipy.io import mmwrite
+    buffer = io.BytesIO()
+    mmwrite(buffer, sparse.coo_matrix(matrix))
+    return buffer.getvalue()
+
+
+def _parquet_bytes(matrix):
+    # Sparse matris uzun (COO) biçimde yazılır: row, column, value sütunları
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet için pyarrow gerekli: pip install pyarrow")
+    coo = sparse.coo_matrix(matrix)
+    table = pa.table({
+        'row': coo.row.astype(np.int32),
+        'column': coo.col.astype(np.int32),
+        'value': coo.data
+    })
+    table = table.replace_schema_metadata({'shape': f'{coo.shape[0]},{coo.shape[1]}'})
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+    return buffer.getvalue()
+
+
+_WRITERS = {
+    'npz': ('matrix.npz', _npz_bytes),
+    'mtx': ('matrix.mtx', _mtx_bytes),
+    'parquet': ('matrix.parquet', _parquet_bytes)
+}
+
+
+def export_bundle(matrix, feature_names, fmt):
+    """
+    Matrisi istenen ikili formatta yazar ve sözlükle birlikte zip olarak döndürür (bytes).
+    vocabulary.txt: satır i = sütun i'nin terimi.
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Desteklenmeyen format: {fmt}. Seçenekler: {', '.join(EXPORT_FORMATS)}")
+    filename, writer = _WRITERS[fmt]
+    data = writer(matrix)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+        bundle.writestr(filename, data)
+        bundle.writestr('vocabulary.txt', ''.join(f'{name}\n' for name in feature_names))
+    return buffer.getvalue()
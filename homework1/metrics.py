@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Performans Metrikleri
+- Aşama başına (temizlik, tokenization, stopword, POS tagging, lemmatization, vektörleştirme)
+  toplam süre ve token sayaçları
+- İstek süresi histogramları (web uygulamaları)
+- Prometheus metin formatında çıktı (/metrics); ek bağımlılık gerektirmez
+Ölçüm isteğe bağlıdır: enable() çağrılmadıkça pipeline'lar yalnızca boş (no-op) zamanlayıcı kullanır.
+Not: Sayaçlar süreç başınadır; çok işçili sunucularda her işçi kendi değerlerini raporlar.
+"""
+
+import time
+import threading
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_enabled = False
+
+
+def enable(flag=True):
+    """Aşama ölçümlerini açar/kapatır."""
+    global _enabled
+    _enabled = flag
+
+
+def enabled():
+    return _enabled
+
+
+def _format_labels(labelnames, values):
+    if not labelnames:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in zip(labelnames, values)
+    )
+    return '{' + pairs + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# ----------------------
+# Metrik tipleri
+# ----------------------
+class Counter:
+    """Yalnızca artan sayaç (etiket değerleri başına ayrı seri)."""
+
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        return self._values.get(key, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield self.name, _format_labels(self.labelnames, key), value
+
+
+class Histogram:
+    """Kümülatif kovalı (bucket) histogram; _bucket, _sum ve _count serileri üretir."""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        # etiket değerleri -> [kova sayıları, toplam, adet]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(e[0]), e[1], e[2])) for key, e in self._values.items())
+        labelnames = self.labelnames + ('le',)
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                yield f'{self.name}_bucket', _format_labels(labelnames, key + (_format_value(bound),)), cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, count
+
+
+class Registry:
+    """Metrikleri tutar ve Prometheus metin formatında yazar."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            # Aynı isimle ikinci kez tanımlanırsa mevcut metrik kullanılır
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def render_stats(groups, prefix='nlplay'):
+    """
+    Önbellek/kuyruk istatistik sözlüklerini gauge olarak yazar.
+    groups: {'lemma_cache': cache.stats(), ...}; sayısal olmayan alanlar atlanır.
+    """
+    lines = []
+    for group, stats in groups.items():
+        for key, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f'{prefix}_{group}_{key}'
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {_format_value(value)}')
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.counter(
+    'nlplay_stage_seconds_total', 'Aşamalarda geçen toplam süre (saniye)', ['pipeline', 'stage'])
+STAGE_TOKENS = REGISTRY.counter(
+    'nlplay_stage_tokens_total', 'Aşama çıkışındaki toplam token sayısı', ['pipeline', 'stage'])
+DOCUMENTS = REGISTRY.counter(
+    'nlplay_documents_total', 'İşlenen belge sayısı', ['pipeline'])
+REQUEST_SECONDS = REGISTRY.histogram(
+    'nlplay_request_duration_seconds', 'HTTP istek süresi (saniye)', ['app', 'endpoint', 'method', 'status'])
+
+
+# ----------------------
+# Aşama zamanlayıcıları
+# ----------------------
+class StageTimer:
+    """
+    Ardışık aşamaların süresini ölçer: lap(aşama) bir önceki lap'ten bu yana geçen süreyi
+    o aşamaya yazar. Değerler yerelde toplanır, flush ile tek seferde kayda geçer.
+    """
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.seconds = {}
+        self.tokens = {}
+        self._last = time.perf_counter()
+
+    def start(self):
+        self._last = time.perf_counter()
+
+    def lap(self, stage, tokens=None):
+        now = time.perf_counter()
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + now - self._last
+        if tokens is not None:
+            self.tokens[stage] = self.tokens.get(stage, 0) + tokens
+        self._last = now
+
+    def flush(self, documents=0):
+        for stage, seconds in self.seconds.items():
+            STAGE_SECONDS.inc(seconds, pipeline=self.pipeline, stage=stage)
+        for stage, tokens in self.tokens.items():
+            STAGE_TOKENS.inc(tokens, pipeline=self.pipeline, stage=stage)
+        if documents:
+            DOCUMENTS.inc(documents, pipeline=self.pipeline)
+        self.seconds = {}
+        self.tokens = {}
+
+
+class _NullTimer:
+    # Ölçüm kapalıyken kullanılır; çağrılar hiçbir şey yapmaz
+    def start(self):
+        pass
+
+    def lap(self, stage, tokens=None):
+        pass
+
+    def flush(self, documents=0):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+def stage_timer(pipeline):
+    """Ölçüm açıksa yeni bir StageTimer, değilse NULL_TIMER döndürür."""
+    return StageTimer(pipeline) if _enabled else NULL_TIMER
+
+
+# ----------------------
+# Flask entegrasyonu
+# ----------------------
+def instrument_app(app, name):
+    """Her isteğin süresini uç nokta, metot ve durum koduna göre REQUEST_SECONDS'a yazar."""
+    from flask import g, request
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        start = g.pop('_metrics_start', None)
+        if start is not None:
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                app=name,
+                endpoint=request.endpoint or 'unknown',
+                method=request.method,
+                status=str(response.status_code)
+            )
+        return response
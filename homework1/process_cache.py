@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+İçerik Adresli /process Önbelleği
+- Anahtar: metinler + dil + tüm ön işleme ayarları + vektörleştirme ayarlarının SHA-256 özeti
+- Sınırlı boyutlu bellek katmanı (LRU, adet ve bayt sınırı)
+- İsteğe bağlı disk katmanı (boyut sınırlı, en eski erişilen dosyalar silinir);
+  girdiler JSON + sparse matrisler için npz olarak saklanır (pickle kullanılmaz),
+  okunamayan veya bozuk girdi ıska sayılır
+- İsabet / ıska istatistikleri
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from result_store import estimate_size
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 256 * 1024**2        # 256 MB
+DEFAULT_DISK_MAX_BYTES = 1024**3         # 1 GB
+
+
+def cache_key(payload):
+    """İstek içeriğinin kanonik JSON gösteriminin SHA-256 özeti."""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _is_sparse(value):
+    return hasattr(value, 'tocsr') and hasattr(value, 'nnz')
+
+
+def _split_matrices(value):
+    """Sonuç sözlüğünden sparse matris alanlarını ayırır: (JSON'a yazılacak sözlük, {alan: CSR})."""
+    matrices = {k: v.tocsr() for k, v in value.items() if _is_sparse(v)}
+    document = {k: v for k, v in value.items() if k not in matrices}
+    return document, matrices
+
+
+class ProcessCache:
+    """
+    anahtar -> sonuç (sözlük). Önce bellek, sonra (varsa) disk katmanına bakılır;
+    diskten okunan sonuç belleğe de alınır.
+    encode / decode: disk katmanına yazmadan önce / okuduktan sonra sonuca uygulanır
+    (ör. JSON'a doğrudan yazılamayan alanları dönüştürmek için); sparse matrisler npz'ye ayrılır.
+    JSON'a çevrilemeyen sonuçlar yalnızca bellekte tutulur.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES,
+                 disk_dir=None, disk_max_bytes=DEFAULT_DISK_MAX_BYTES, encode=None, decode=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.encode = encode
+        self.decode = decode
+        # anahtar -> (sonuç, boyut)
+        self._memory = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    # ----------------------
+    # Bellek katmanı
+    # ----------------------
+    def _memory_put(self, key, value):
+        size = estimate_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._memory[key] = (value, size)
+            self._bytes += size
+            while self._memory and (
+                (self.max_entries is not None and len(self._memory) > self.max_entries)
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                _, (_, evicted_size) = self._memory.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    # ----------------------
+    # Disk katmanı
+    # ----------------------
+    def _disk_path(self, key, ext='.json'):
+        return os.path.join(self.disk_dir, f'{key}{ext}')
+
+    def _disk_get(self, key):
+        path = self._disk_path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                value = json.load(f)
+            matrix_fields = value.pop('__matrices__')
+            if matrix_fields:
+                from scipy import sparse
+                with np.load(self._disk_path(key, '.npz'), allow_pickle=False) as arrays:
+                    for field in matrix_fields:
+                        value[field] = sparse.csr_matrix(
+                            (arrays[f'{field}.data'], arrays[f'{field}.indices'], arrays[f'{field}.indptr']),
+                            shape=tuple(arrays[f'{field}.shape'])
+                        )
+            if self.decode is not None:
+                value = self.decode(value)
+        except Exception:
+            # Eksik, yarım yazılmış, bozuk veya eski biçimdeki girdi ıska sayılır
+            return None
+        # Erişim zamanı güncellenir: disk temizliğinde en eski erişilenler silinir
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def _disk_put(self, key, value):
+        if self.encode is not None:
+            value = self.encode(value)
+        document, matrices = _split_matrices(value)
+        document['__matrices__'] = sorted(matrices)
+        try:
+            text = json.dumps(document, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return
+        path = self._disk_path(key)
+        suffix = f'.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            # Önce matrisler, en son JSON yayımlanır: JSON varsa girdi tamdır
+            if matrices:
+                arrays = {}
+                for field, matrix in matrices.items():
+                    arrays.update({
+                        f'{field}.data': matrix.data,
+                        f'{field}.indices': matrix.indices,
+                        f'{field}.indptr': matrix.indptr,
+                        f'{field}.shape': np.array(matrix.shape, dtype=np.int64)
+                    })
+                npz_path = self._disk_path(key, '.npz')
+                with open(npz_path + suffix, 'wb') as f:
+                    np.savez(f, **arrays)
+                os.replace(npz_path + suffix, npz_path)
+            with open(path + suffix, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(path + suffix, path)
+        except OSError:
+            return
+        self._disk_evict()
+
+    def _disk_remove(self, json_path):
+        # JSON önce silinir: girdi yarım kalırsa okunmaz
+        for path in (json_path, json_path[:-len('.json')] + '.npz'):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _disk_evict(self):
+        if self.disk_max_bytes is None:
+            return
+        files = []
+        total = 0
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.json'):
+                try:
+                    stat = entry.stat()
+                    size = stat.st_size
+                    npz_path = entry.path[:-len('.json')] + '.npz'
+                    if os.path.exists(npz_path):
+                        size += os.path.getsize(npz_path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, size, entry.path))
+                total += size
+        files.sort()
+        for _, size, path in files:
+            if total <= self.disk_max_bytes:
+                break
+            self._disk_remove(path)
+            total -= size
+            self.evictions += 1
+
+    # ----------------------
+    # Genel arayüz
+    # ----------------------
+    def get(self, key):
+        """Önbellekteki sonucu döndürür; yoksa None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[0]
+        if self.disk_dir:
+            value = self._disk_get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self._memory_put(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._memory_put(key, value)
+        if self.disk_dir:
+            self._disk_put(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._bytes = 0
+        if self.disk_dir:
+            for entry in os.scandir(self.disk_dir):
+                if entry.name.endswith('.json'):
+                    self._disk_remove(entry.path)
+
+    def stats(self):
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            return {
+                'entries': len(self._memory),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'disk_dir': self.disk_dir,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_ratio': hits / total if total else 0.0,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Sonuç Deposu
+- Her /process çağrısının sonucu kendi kimliğiyle (result_id) saklanır
+- LRU ve TTL (yaşam süresi) ile otomatik silme
+- Yaklaşık bellek bütçesi (bayt) sınırı
+- Thread-safe erişim
+"""
+
+import sys
+import time
+import uuid
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 100
+DEFAULT_TTL = 3600                  # saniye
+DEFAULT_MAX_BYTES = 512 * 1024**2   # 512 MB
+
+
+def estimate_size(value):
+    """Bir sonucun bellekte kapladığı yaklaşık bayt sayısı (numpy/scipy dizileri dahil)."""
+    # scipy sparse matrisler
+    if hasattr(value, 'indptr') and hasattr(value, 'data'):
+        return value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+    # numpy dizileri
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class ResultStore:
+    """
+    result_id -> sonuç sözlüğü.
+    Kapasite (adet ya da bayt) aşılınca en uzun süredir kullanılmayan sonuçlar silinir;
+    ttl saniyeden uzun süredir kullanılmayan sonuçlar da okunamaz hale gelir.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL,
+                 max_bytes=DEFAULT_MAX_BYTES, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        # result_id -> [sonuç, boyut, son erişim zamanı]
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def put(self, result):
+        """Sonucu saklar ve yeni result_id döndürür."""
+        size = estimate_size(result)
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise ValueError('Sonuç, sonuç deposunun bellek bütçesini aşıyor!')
+        result_id = uuid.uuid4().hex
+        with self._lock:
+            self._entries[result_id] = [result, size, self._clock()]
+            self._bytes += size
+            self._evict()
+        return result_id
+
+    def get(self, result_id):
+        """Sonucu döndürür; yoksa ya da süresi dolduysa None."""
+        with self._lock:
+            entry = self._entries.get(result_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            now = self._clock()
+            if self.ttl is not None and now - entry[2] > self.ttl:
+                self._remove(result_id)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            entry[2] = now
+            self._entries.move_to_end(result_id)
+            self.hits += 1
+            return entry[0]
+
+    def update(self, result_id, **fields):
+        """Var olan bir sonuca alan ekler (ör. önbelleklenmiş grafikler); boyut yeniden hesaplanır."""
+        with self._lock:
+            entry = self._entries.get(result_id)
+            if entry is None:
+                return False
+            entry[0].update(fields)
+            size = estimate_size(entry[0])
+            self._bytes += size - entry[1]
+            entry[1] = size
+            self._evict(keep=result_id)
+            return True
+
+    def delete(self, result_id):
+        with self._lock:
+            return self._remove(result_id)
+
+    def _remove(self, result_id):
+        entry = self._entries.pop(result_id, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[1]
+        return True
+
+    def _evict(self, keep=None):
+        # Önce süresi dolanlar, sonra LRU sırasıyla kapasite aşımı temizlenir
+        if self.ttl is not None:
+            now = self._clock()
+            for result_id in [rid for rid, e in self._entries.items() if now - e[2] > self.ttl]:
+                if result_id != keep:
+                    self._remove(result_id)
+                    self.expirations += 1
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                if len(self._entries) == 1:
+                    break
+                self._entries.move_to_end(oldest)
+                continue
+            self._remove(oldest)
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,41 +1,84 @@
 # -*- coding: utf-8 -*-
 """
 NLTK Setup Script
-Gerekli NLTK verilerini indirir
+Gerekli NLTK verilerini indirir ve yerel olarak kurulu olup olmadıklarını kontrol eder
 """
 
-import nltk
 import ssl
 
-try:
-    _create_unverified_https_context = ssl._create_unverified_context
-except AttributeError:
-    pass
-else:
-    ssl._create_default_https_context = _create_unverified_https_context
+# Gerekli NLTK verileri: mantıksal ad -> (indirme adı, nltk.data içinde aranacak yol).
+# NLTK 3.8.2 ile punkt ve perceptron tagger pickle yerine punkt_tab / *_eng (JSON) verilerini
+# yüklemeye başladı; kontrol ve indirme kurulu sürümün gerçekten yüklediği kaynağa göre yapılır.
+NLTK_RESOURCES = ('punkt', 'stopwords', 'wordnet', 'omw-1.4', 'averaged_perceptron_tagger')
+
+def nltk_resource_paths():
+    """Kurulu NLTK sürümü için mantıksal ad -> (indirme adı, veri yolu) eşlemesi."""
+    from nltk.tokenize import punkt
+    from nltk.tag import perceptron
+    if hasattr(punkt, 'PunktTokenizer'):
+        punkt_resource = ('punkt_tab', 'tokenizers/punkt_tab')
+    else:
+        punkt_resource = ('punkt', 'tokenizers/punkt')
+    if hasattr(perceptron.PerceptronTagger, 'load_from_json'):
+        tagger_resource = ('averaged_perceptron_tagger_eng', 'taggers/averaged_perceptron_tagger_eng')
+    else:
+        tagger_resource = ('averaged_perceptron_tagger', 'taggers/averaged_perceptron_tagger')
+    return {
+        'punkt': punkt_resource,
+        'stopwords': ('stopwords', 'corpora/stopwords'),
+        'wordnet': ('wordnet', 'corpora/wordnet'),
+        'omw-1.4': ('omw-1.4', 'corpora/omw-1.4'),
+        'averaged_perceptron_tagger': tagger_resource
+    }
+
+def _allow_unverified_https():
+    # Bazı sistemlerde sertifika doğrulaması indirmeyi engeller
+    try:
+        _create_unverified_https_context = ssl._create_unverified_context
+    except AttributeError:
+        pass
+    else:
+        ssl._create_default_https_context = _create_unverified_https_context
+
+def missing_nltk_resources(names=None):
+    """Yerelde bulunmayan NLTK kaynaklarının listesini döndürür (ağ erişimi yapmaz)."""
+    import nltk
+    resources = nltk_resource_paths()
+    missing = []
+    for name in (NLTK_RESOURCES if names is None else names):
+        try:
+            nltk.data.find(resources[name][1])
+        except LookupError:
+            missing.append(name)
+    return missing
+
+def check_nltk_resources(names=None):
+    """Eksik NLTK kaynağı varsa açık bir mesajla hemen LookupError fırlatır."""
+    missing = missing_nltk_resources(names)
+    if missing:
+        raise LookupError(
+            f"Eksik NLTK verileri: {', '.join(missing)}. "
+            f"Kurmak için 'python setup_nltk.py' çalıştırın "
+            f"veya NLTK_DATA ortam değişkeniyle veri klasörünü gösterin."
+        )
 
 def download_nltk_data():
     #NLTK verilerini indir
+    import nltk
+    _allow_unverified_https()
     print("NLTK verileri indiriliyor...")
-    
-    # Gerekli NLTK verileri
-    nltk_data = [
-        'punkt',
-        'stopwords', 
-        'wordnet',
-        'omw-1.4',
-        'averaged_perceptron_tagger'
-    ]
-    
-    for data in nltk_data:
+
+    resources = nltk_resource_paths()
+    for name in NLTK_RESOURCES:
+        data = resources[name][0]
         try:
             print(f"İndiriliyor: {data}")
             nltk.download(data, quiet=False)
             print(f"✓ {data} başarıyla indirildi")
         except Exception as e:
             print(f"✗ {data} indirilemedi: {e}")
-    
+
     print("\nNLTK kurulumu tamamlandı!")
 
 if __name__ == "__main__":
-    download_nltk_data() 
\ No newline at end of file
+    download_nltk_data()
@@ -4,30 +4,32 @@ Basit NLP Pipeline
 """
 
 import re
-import nltk
-from collections import Counter
 
-# NLTK verilerini indir
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-    nltk.download('wordnet', quiet=True)
-    nltk.download('averaged_perceptron_tagger', quiet=True)
-except:
-    print("NLTK verileri indirilemedi, devam ediliyor...")
+from basic_pipeline import count_matrix, most_frequent_terms
+from text_utils import dedup_texts, fan_out, duplicate_ratio
+from token_ids import EncodedCorpus
+from lemma_cache import wordnet_lemmatize
+from setup_nltk import check_nltk_resources
 
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-
-def simple_preprocess_texts(texts, language='english'):
+def simple_preprocess_texts(texts, language='english', dedup=False, output='text'):
     """
     Basit ön işleme pipeline'ı
+    dedup=True ise aynı metinler bir kez işlenir
+    output='ids' ise processed_texts bir EncodedCorpus'tur (int32 token id'leri)
+    Returns: processed_texts, stats, duplicate_ratio (dedup=False ise 0.0)
     """
-    processed_texts = []
-    stats = []
+    if dedup:
+        unique_texts, positions = dedup_texts(texts)
+        processed_texts, stats, _ = simple_preprocess_texts(unique_texts, language, output=output)
+        return (*fan_out(processed_texts, stats, positions), duplicate_ratio(unique_texts, positions))
     
-    lemmatizer = WordNetLemmatizer()
+    # NLTK verileri içe aktarma sırasında indirilmez; eksikse hemen bildirilir
+    check_nltk_resources(['punkt', 'stopwords', 'wordnet'])
+    from nltk.tokenize import word_tokenize
+    from nltk.corpus import stopwords
+    
+    processed_texts = EncodedCorpus() if output == 'ids' else []
+    stats = []
     
     for text in texts:
         orig_len = len(text.split())
@@ -59,10 +61,10 @@ def simple_preprocess_texts(texts, language='english'):
         # 5. Lemmatization
         lemmatized_tokens = []
         for token in filtered_tokens:
-            lemmatized = lemmatizer.lemmatize(token)
+            lemmatized = wordnet_lemmatize(token)
             lemmatized_tokens.append(lemmatized)
         
-        processed_texts.append(' '.join(lemmatized_tokens))
+        processed_texts.append(lemmatized_tokens if output == 'ids' else ' '.join(lemmatized_tokens))
         
         stats.append({
             'original_word_count': orig_len,
@@ -70,33 +72,20 @@ def simple_preprocess_texts(texts, language='english'):
             'final_word_count': len(lemmatized_tokens)
         })
     
-    return processed_texts, stats
+    return processed_texts, stats, 0.0
 
-def simple_vectorize(texts, method='tfidf'):
+def simple_vectorize(texts, method='tfidf', dense=False):
     
     #Basit vektörleştirme (TF-IDF benzeri)
+    #dense=True ise matris eskisi gibi liste listesi olarak döner
     
-    # Tüm kelimeleri topla
-    all_words = []
-    for text in texts:
-        all_words.extend(text.split())
-    
-    # Kelime frekanslarını hesapla
-    word_freq = Counter(all_words)
-    
-    # En sık kelimeleri al (feature names)
-    feature_names = [word for word, freq in word_freq.most_common(20)]
+    # En sık kelimeleri al (feature names); EncodedCorpus ise id'ler doğrudan sayılır
+    feature_names = most_frequent_terms(texts, 20)
     
     # Matrix oluştur
-    matrix = []
-    for text in texts:
-        text_words = text.split()
-        row = []
-        for feature in feature_names:
-            count = text_words.count(feature)
-            row.append(count)
-        matrix.append(row)
-    
+    matrix = count_matrix(texts, feature_names)
+    if dense:
+        return feature_names, matrix.tolist()
     return feature_names, matrix
 
 def print_results(original_texts, processed_texts, stats, feature_names, matrix):
@@ -158,7 +147,7 @@ if __name__ == "__main__":
     ]
     
     # Ön işleme
-    processed_texts, stats = simple_preprocess_texts(corpus, language='english')
+    processed_texts, stats, _ = simple_preprocess_texts(corpus, language='english')
     
     # Vektörleştirme
     feature_names, matrix = simple_vectorize(processed_texts, method='tfidf')
@@ -3,50 +3,119 @@
 Basit Flask Web Uygulaması - NLP Pipeline
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Blueprint, Response, render_template, request, jsonify, current_app
 import os
-from basic_pipeline import basic_preprocess_texts, basic_vectorize
+import gc
+import metrics
+from basic_pipeline import get_basic_pipeline, basic_preprocess_texts, basic_vectorize
+from text_utils import SUPPORTED_LANGUAGES
+from process_cache import ProcessCache, cache_key
 
-app = Flask(__name__)
+bp = Blueprint('simple_nlp', __name__)
 
-@app.route('/')
+@bp.route('/')
 def index():
     return render_template('simple_index.html')
 
-@app.route('/process', methods=['POST'])
+@bp.route('/process', methods=['POST'])
 def process_texts():
     try:
         data = request.get_json()
         texts = data.get('texts', [])
         language = data.get('language', 'english')
+        dedup = data.get('dedup', False)
         
         if not texts:
             return jsonify({'error': 'Metin girişi gerekli!'}), 400
+        if language not in SUPPORTED_LANGUAGES:
+            return jsonify({'error': f"Desteklenmeyen dil! Seçenekler: {', '.join(SUPPORTED_LANGUAGES)}"}), 400
         
-        # Ön işleme
-        processed_texts, stats = basic_preprocess_texts(texts, language=language)
+        # Aynı metin + dil daha önce işlendiyse yanıt önbellekten döner
+        cache = current_app.extensions['process_cache']
+        key = cache_key({'texts': texts, 'language': language, 'max_features': 20, 'dedup': dedup})
+        cached = cache.get(key)
+        if cached is not None:
+            return jsonify(cached)
+        
+        # Ön işleme (dil başına tek BasicPipeline örneği kullanılır)
+        processed_texts, stats, dup_ratio = basic_preprocess_texts(texts, language, dedup=dedup)
         
         # Vektörleştirme
         feature_names, matrix = basic_vectorize(processed_texts, max_features=20)
         
-        return jsonify({
+        response = {
             'success': True,
             'message': f'{len(texts)} metin başarıyla işlendi',
             'original_texts': texts,
             'processed_texts': processed_texts,
             'stats': stats,
             'feature_names': feature_names,
-            'matrix': matrix
-        })
+            'matrix': matrix.tolist()
+        }
+        if dedup:
+            response['duplicate_ratio'] = dup_ratio
+        cache.put(key, response)
+        return jsonify(response)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@bp.route('/metrics')
+def metrics_endpoint():
+    #Prometheus formatında aşama süreleri, istek süreleri ve önbellek istatistikleri
+    body = metrics.REGISTRY.render() + metrics.render_stats({
+        'process_cache': current_app.extensions['process_cache'].stats()
+    })
+    return Response(body, content_type=metrics.CONTENT_TYPE)
+
+# ----------------------
+# Uygulama fabrikası ve ısınma (warm-up)
+# ----------------------
+def warm_up_app(app):
+    #Dil başına BasicPipeline'ları kurup örnek metinle çalıştırır
+    for language in app.config['WARMUP_LANGUAGES']:
+        processed_texts, _ = get_basic_pipeline(language).process(["Warming up the basic pipeline."])
+        basic_vectorize(processed_texts)
+    # fork edilen işçilerde copy-on-write paylaşımı bozulmasın
+    gc.freeze()
+
+def create_app(config=None, warmup=True):
+    """
+    Uygulama fabrikası.
+    Çok işçili WSGI sunucuları için: gunicorn --preload -w 4 "simple_web_app:create_app()"
+    """
+    app = Flask(__name__)
+    app.config['WARMUP_LANGUAGES'] = ('english', 'turkish')
+    app.config['PROCESS_CACHE_MAX_ENTRIES'] = 256
+    app.config['PROCESS_CACHE_MAX_BYTES'] = 256 * 1024**2
+    app.config['PROCESS_CACHE_DIR'] = os.environ.get('NLPLAY_CACHE_DIR')
+    app.config['PROCESS_CACHE_DISK_MAX_BYTES'] = 1024**3
+    app.config['METRICS_ENABLED'] = True
+    if config:
+        app.config.update(config)
+    app.extensions['process_cache'] = ProcessCache(
+        max_entries=app.config['PROCESS_CACHE_MAX_ENTRIES'],
+        max_bytes=app.config['PROCESS_CACHE_MAX_BYTES'],
+        disk_dir=app.config['PROCESS_CACHE_DIR'],
+        disk_max_bytes=app.config['PROCESS_CACHE_DISK_MAX_BYTES']
+    )
+    if app.config['METRICS_ENABLED']:
+        metrics.enable()
+        metrics.instrument_app(app, 'simple_web_app')
+    app.register_blueprint(bp)
+    if warmup:
+        warm_up_app(app)
+    return app
+
+# Geriye dönük uyumluluk için; ısınma yapılmaz
+app = create_app(warmup=False)
+
 if __name__ == '__main__':
     # Templates klasörü oluştur
     if not os.path.exists('templates'):
         os.makedirs('templates')
     
     print("Basit Flask web uygulaması başlatılıyor...")
+    app = create_app()
     print("Tarayıcınızda http://localhost:5000 adresini açın")
     app.run(debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
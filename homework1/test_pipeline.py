@@ -4,7 +4,22 @@ NLP Pipeline Test Script
 Basit test için kullanılır
 """
 
+import os
+import tempfile
 from main import preprocess_texts, vectorize_texts, read_texts_from_file
+from lemma_cache import LemmaCache
+from basic_pipeline import basic_vectorize
+from incremental_tfidf import IncrementalTfidf
+from result_store import ResultStore
+from process_cache import ProcessCache, cache_key
+from benchmark import run_benchmarks, compare_to_baseline, stage_laps
+import metrics
+from basic_pipeline import get_basic_pipeline, basic_preprocess_texts
+from text_utils import SUPPORTED_LANGUAGES
+from token_ids import EncodedCorpus
+from corpus_cache import CorpusCache, corpus_fingerprint, corpus_key, file_fingerprint
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_data.txt')
 
 def test_pipeline():
     print("=" * 50)
@@ -61,5 +76,546 @@ def test_pipeline():
     print("TEST TAMAMLANDI!")
     print("=" * 50)
 
+def test_lemma_cache():
+    print("\nLemma önbelleği testi...")
+    calls = []
+    def compute(token, pos):
+        calls.append((token, pos))
+        return token.rstrip('s')
+
+    cache = LemmaCache(maxsize=2)
+    assert cache.lookup('cats', 'n', compute) == 'cat'
+    assert cache.lookup('cats', 'n', compute) == 'cat'
+    assert cache.lookup('dogs', 'n', compute) == 'dog'
+    # ('cats','n') en son kullanıldığı için ('dogs','n') değil o kalmalı
+    cache.lookup('cats', 'n', compute)
+    cache.lookup('birds', 'n', compute)
+    cache.lookup('dogs', 'n', compute)
+
+    stats = cache.stats()
+    assert stats['hits'] == 2 and stats['misses'] == 4
+    assert stats['size'] == 2
+    assert calls.count(('dogs', 'n')) == 2
+    print(f"   {stats}")
+
+def test_basic_vectorize_sparse():
+    print("\nSparse sayım matrisi testi...")
+    texts = ["ai data ai", "data model", "", "ai ai ai model"]
+    feature_names, matrix = basic_vectorize(texts, max_features=20)
+    # Eski yöntemle (text.count) hesaplanan dense matrisle aynı olmalı
+    expected = [[text.split().count(f) for f in feature_names] for text in texts]
+    assert matrix.tolist() == expected
+    assert basic_vectorize(texts, max_features=20, dense=True)[1] == expected
+    assert matrix.shape == (4, 3) and matrix.nnz == 6
+    print(f"   {feature_names} -> {matrix.tolist()}")
+
+def test_incremental_tfidf():
+    print("\nArtımlı TF-IDF testi...")
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    corpus = ["ai data model", "data data science", "ai ethics", "deep learning model"]
+    queries = ["ai model unknown", "data science"]
+
+    model = IncrementalTfidf().partial_fit(corpus[:2]).partial_fit(corpus[2:])
+    reference = TfidfVectorizer().fit(corpus)
+    # Sütun sıraları farklıdır: referans sırasına göre hizala
+    names = list(model.get_feature_names_out())
+    # Sütunlar terimlerin ilk görülme sırasındadır (çalıştırmadan çalıştırmaya değişmez)
+    assert names == ['ai', 'data', 'model', 'science', 'ethics', 'deep', 'learning']
+    order = [names.index(term) for term in reference.get_feature_names_out()]
+    assert np.allclose(model.transform(queries).toarray()[:, order], reference.transform(queries).toarray())
+
+    # Checkpoint sonrası aynı sonuç ve kaldığı yerden devam
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'incremental_tfidf_test.npz')
+        model.save(path)
+        restored = IncrementalTfidf.load(path)
+    assert np.allclose(restored.transform(queries).toarray(), model.transform(queries).toarray())
+    restored.partial_fit(["new document"])
+    assert restored.n_docs == 5
+    print(f"   {restored.n_docs} belge, {len(restored.vocabulary)} terim")
+
+def test_result_store():
+    print("\nSonuç deposu testi...")
+    now = [0.0]
+    store = ResultStore(max_entries=2, ttl=10, max_bytes=None, clock=lambda: now[0])
+    a = store.put({'texts': ['a']})
+    b = store.put({'texts': ['b']})
+    store.get(a)
+    c = store.put({'texts': ['c']})
+    # b en uzun süredir kullanılmayan -> LRU ile silinir
+    assert store.get(b) is None and store.get(a) is not None and store.get(c) is not None
+    now[0] = 11
+    assert store.get(a) is None
+    assert store.stats()['evictions'] == 1 and store.stats()['expirations'] == 1
+
+    # Bellek bütçesi aşılırsa en eski sonuçlar silinir
+    store = ResultStore(max_entries=None, ttl=None, max_bytes=2000)
+    ids = [store.put({'text': 'x' * 600}) for _ in range(4)]
+    assert store.get(ids[0]) is None and store.get(ids[-1]) is not None
+    assert store.stats()['bytes'] <= 2000
+    print(f"   {store.stats()}")
+
+def test_process_cache():
+    print("\nİşlem önbelleği testi...")
+    # Anahtar sözlük sırasından bağımsız, ayar değişikliğine duyarlı
+    assert cache_key({'texts': ['a'], 'language': 'english'}) == cache_key({'language': 'english', 'texts': ['a']})
+    assert cache_key({'texts': ['a'], 'language': 'english'}) != cache_key({'texts': ['a'], 'language': 'turkish'})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ProcessCache(max_entries=1, disk_dir=tmp)
+        cache.put('k1', {'processed_texts': ['cat run']})
+        cache.put('k2', {'processed_texts': ['dog bark']})
+        # k1 bellekten düştü ama diskten okunur
+        assert cache.get('k1') == {'processed_texts': ['cat run']}
+        assert cache.get('k3') is None
+        stats = cache.stats()
+        assert stats['disk_hits'] == 1 and stats['misses'] == 1
+        print(f"   {stats}")
+
+        # Sparse matris npz'ye ayrılır; dtype ve değerler korunur
+        import numpy as np
+        from scipy import sparse
+        matrix = sparse.csr_matrix(np.array([[0, 1.5], [2, 0]], dtype=np.float32))
+        ProcessCache(disk_dir=tmp).put('k4', {'matrix': matrix, 'feature_names': ['a', 'b']})
+        value = ProcessCache(disk_dir=tmp).get('k4')
+        assert value['feature_names'] == ['a', 'b'] and value['matrix'].dtype == np.float32
+        assert (value['matrix'] != matrix).nnz == 0
+        # Bozuk girdi ıska sayılır
+        with open(os.path.join(tmp, 'k4.json'), 'w') as f:
+            f.write('{"matrix"')
+        assert ProcessCache(disk_dir=tmp).get('k4') is None
+
+def test_job_queue():
+    print("\nArka plan iş kuyruğu testi...")
+    import time
+    import threading
+    from jobs import JobQueue
+
+    def wait(queue, job_id, statuses=('done', 'failed')):
+        for _ in range(200):
+            job = queue.get(job_id)
+            if job['status'] in statuses:
+                return job
+            time.sleep(0.01)
+        raise AssertionError(f'İş beklenen duruma geçmedi: {job}')
+
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking(progress):
+        progress(1)
+        started.set()
+        release.wait(5)
+        return 'ok'
+
+    def failing(progress):
+        raise RuntimeError('bozuk')
+
+    # Tek işçi: ilk iş çalışırken ikincisi kuyrukta bekler
+    queue = JobQueue(max_workers=1, max_finished=2)
+    try:
+        first = queue.submit(blocking, total=2)
+        second = queue.submit(failing, total=1)
+        started.wait(5)
+        job = queue.get(first)
+        assert job['status'] == 'running' and job['done'] == 1
+        assert queue.get(second)['status'] == 'queued'
+        release.set()
+        # İşler sırayla çalışır: ikincisi bittiğinde ilki de bitmiştir
+        job = wait(queue, second)
+        assert job['status'] == 'failed' and job['error'] == 'bozuk'
+        job = queue.get(first)
+        assert job['status'] == 'done' and job['result'] == 'ok' and job['done'] == 2
+        # max_finished=2: üçüncü iş bitince en eski bitmiş iş silinir
+        wait(queue, queue.submit(lambda progress: None, total=1))
+        assert queue.get(first) is None and queue.get(second) is not None and queue.get('yok') is None
+        assert queue.stats() == {'queued': 0, 'running': 0, 'done': 1, 'failed': 1}
+    finally:
+        release.set()
+        queue.shutdown()
+    print("   queued -> running -> done/failed, eski işler silindi")
+
+def test_benchmark_regression():
+    print("\nBenchmark regresyon kontrolü testi...")
+    report = run_benchmarks(['basic'], ['synthetic'], [50], repeat=1, log=lambda *_: None)
+    names = {entry['name'] for entry in report['results']}
+    assert {'stage:tokenize', 'stage:lemmatize', 'pipeline', 'vectorize:basic'} <= names
+    assert compare_to_baseline(report, report) == []
+
+    # Süresi 10 kat artan ölçüm regresyon olarak yakalanır
+    slower = {'results': [dict(entry, seconds=entry['seconds'] * 10 + 1) for entry in report['results']]}
+    regressions = compare_to_baseline(slower, report, threshold=0.25)
+    assert len(regressions) == len(report['results'])
+    print(f"   {len(regressions)} regresyon yakalandı")
+
+    # Adım süreleri pipeline'ın kendi lap'lerinden okunur; ölçüm durumu geri alınır
+    run = lambda texts: get_basic_pipeline('english').process(texts)
+    laps = stage_laps(run, 'basic', ('tokenize', 'pos_tagging', 'lemmatize'))(["The cats are running."])
+    assert set(laps) == {'tokenize', 'lemmatize'} and not metrics.enabled()
+
+def test_stage_metrics():
+    print("\nAşama metrikleri testi...")
+    metrics.enable()
+    try:
+        before = metrics.STAGE_TOKENS.value(pipeline='basic', stage='tokenize')
+        get_basic_pipeline('english').process(["The cats are running.", "Dogs barked."])
+        assert metrics.STAGE_TOKENS.value(pipeline='basic', stage='tokenize') - before == 6
+        assert metrics.STAGE_SECONDS.value(pipeline='basic', stage='lemmatize') > 0
+        # Generator girdisinde belge sayısı döngü içinde sayılır
+        processed, _ = get_basic_pipeline('english').process(t for t in ["Dogs barked."])
+        assert processed == ["dog bark"]
+    finally:
+        metrics.enable(False)
+    text = metrics.REGISTRY.render()
+    assert 'nlplay_stage_seconds_total{pipeline="basic",stage="stopwords"}' in text
+    print("   Prometheus çıktısı üretildi")
+
+def test_basic_dedup():
+    print("\nTekrar eden metin (dedup) testi...")
+    texts = ["The cats are running.", "the  cats are running.", "Dogs barked.", "The cats are running."]
+    processed, stats, ratio = basic_preprocess_texts(texts, dedup=True)
+    expected_processed, expected_stats, no_dedup_ratio = basic_preprocess_texts(texts)
+    assert processed == expected_processed and stats == expected_stats
+    assert ratio == 0.5 and no_dedup_ratio == 0.0
+    # Her belge kendi stats sözlüğünü alır
+    assert stats[0] is not stats[1]
+    print(f"   Tekrar oranı: {ratio:.0%}")
+
+def test_token_ids():
+    print("\nToken id (EncodedCorpus) testi...")
+    texts = ["The cats are running quickly.", "Dogs barked at the cats.", ""]
+    processed, _, _ = basic_preprocess_texts(texts)
+    corpus, _, _ = basic_preprocess_texts(texts, output='ids')
+    assert isinstance(corpus, EncodedCorpus) and corpus.ids.typecode == 'i'
+    assert corpus.texts() == processed
+    # Vektörleştirici id'leri doğrudan kullanır; sonuç string yolu ile aynıdır
+    names, matrix = basic_vectorize(processed)
+    id_names, id_matrix = basic_vectorize(corpus)
+    assert names == id_names and matrix.tolist() == id_matrix.tolist()
+    print(f"   {len(corpus.vocabulary)} terim, {len(corpus.ids)} token")
+
+def test_corpus_cache():
+    print("\nKalıcı korpus önbelleği testi...")
+    texts = ["The cats are running quickly.", "Dogs barked at the cats.", "", "Cats sleep."]
+    pipeline = get_basic_pipeline('english')
+    expected, expected_stats, _ = basic_preprocess_texts(texts)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = CorpusCache(cache_dir)
+        key = corpus_key(corpus_fingerprint(texts), {'pipeline': 'basic', 'language': 'english'})
+        assert cache.get(key) is None
+        # İki grup halinde, ortak sözlükle yazılır
+        writer = cache.writer(key)
+        for batch in (texts[:2], texts[2:]):
+            corpus, stats = pipeline.process(batch, output='ids', vocabulary=writer.vocabulary)
+            writer.write(corpus, stats)
+        writer.commit()
+        corpus, stats, meta = cache.get(key)
+        assert meta['documents'] == len(texts)
+        assert not corpus.ids.flags.writeable
+        assert corpus.texts() == expected and list(stats) == expected_stats
+        names, matrix = basic_vectorize(expected)
+        id_names, id_matrix = basic_vectorize(corpus)
+        assert names == id_names and matrix.tolist() == id_matrix.tolist()
+        assert corpus_key(corpus_fingerprint(texts[::-1]), {}) != corpus_key(corpus_fingerprint(texts), {})
+        # Aynı dosyadan farklı sütun seçimleri farklı girdilerdir
+        csv_path = os.path.join(cache_dir, 'veri.csv')
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write("title,body\nFirst,Second\n")
+        assert file_fingerprint(csv_path, columns=['title']) != file_fingerprint(csv_path, columns=['body'])
+        assert file_fingerprint(csv_path, columns=['body']) == file_fingerprint(csv_path, columns=['body'])
+        print(f"   {meta['tokens']} token, {meta['vocabulary_size']} terim diskten açıldı")
+        del corpus, stats
+
+def test_ngram_pruning():
+    print("\nN-gram ve sözlük budama testi...")
+    from sklearn.feature_extraction.text import CountVectorizer
+    texts = basic_preprocess_texts(read_texts_from_file(SAMPLE_PATH))[0]
+    corpus, _, _ = basic_preprocess_texts(read_texts_from_file(SAMPLE_PATH), output='ids')
+    # Sınır yokken sonuç sklearn ile aynıdır (string ve id girdisi için)
+    reference = CountVectorizer(ngram_range=(1, 2), min_df=2, max_df=0.5)
+    expected = reference.fit_transform(texts)
+    for source in (texts, corpus):
+        names, matrix, report = vectorize_texts(
+            source, method='count', max_features=None, sparse=True,
+            ngram_range=(1, 2), min_df=2, max_df=0.5, report=True)
+        assert list(names) == list(reference.get_feature_names_out())
+        assert (matrix != expected).nnz == 0
+    assert report['pruned_min_df'] > 0 and report['pruned_memory'] == 0
+    # Bellek sınırı sayım sırasında uygulanır
+    names, matrix, report = vectorize_texts(
+        texts, method='count', max_features=None, ngram_range=(1, 2), max_vocabulary=50, report=True)
+    assert report['peak_vocabulary'] <= 50 + max(len(t.split()) for t in texts) * 2
+    assert report['pruned_memory'] > 0 and len(names) <= 50
+    print(f"   {report['vocabulary_size']} terim kaldı, {report['pruned_total']} terim budandı")
+
+def test_vocabulary_cap_pruning():
+    print("\nSözlük sınırı budama testi...")
+    import time
+    # Sözlük doluyken gelen yeni terimler her belgede tüm sözlüğü yeniden kurdurmamalı
+    docs = [' '.join(f'w{i}x{j}' for j in range(10)) for i in range(4000)] + [f'y{i}' for i in range(20000)]
+    start = time.perf_counter()
+    _, _, report = vectorize_texts(
+        docs, method='count', max_features=None, max_vocabulary=20000, sparse=True, report=True)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 10, elapsed
+    assert report['peak_vocabulary'] <= 20000 + 10
+    # Sonradan sık görülmeye başlayan terim eski terimler yüzünden dışarıda kalmamalı
+    docs = [f't{i}' for i in range(100)] * 2 + ['latecomer'] * 300
+    names, _, report = vectorize_texts(
+        docs, method='count', max_features=10, max_vocabulary=100, sparse=True, report=True)
+    assert 'latecomer' in list(names)
+    print(f"   {elapsed:.2f} sn, {report['pruned_memory']} terim sayım sırasında budandı")
+
+def test_pipeline_without_nltk_steps():
+    print("\nNLTK verisi gerektirmeyen ayarlar testi...")
+    from main import Pipeline
+    from setup_nltk import missing_nltk_resources
+    assert missing_nltk_resources([]) == []
+    for language in ('english', 'turkish'):
+        pipeline = Pipeline(language=language, do_tokenize=False, remove_stopwords=False, do_lemmatization=False)
+        result = pipeline.process(["Merhaba Dünya, 2024!"])
+        assert result['processed_texts'] == ['merhaba dünya']
+    print("   Tokenization/stopword/lemmatization kapalıyken NLTK verisi aranmadı")
+
+# NLTK verisi gerektirmeyen ön işleme ayarları (web testleri için)
+NO_NLTK_OPTIONS = {'do_tokenize': False, 'remove_stopwords': False, 'do_lemmatization': False}
+
+def _web_client(**config):
+    from web_app import create_app
+    return create_app(dict({'METRICS_ENABLED': False}, **config), warmup=False).test_client()
+
+def test_parallel_matches_serial():
+    print("\nParalel (workers>1) ön işleme testi...")
+    texts = [f"Cats and dogs {i}, birds sing!" for i in range(9)] + ["", "Same text.", "same  TEXT."]
+    serial = preprocess_texts(texts, **NO_NLTK_OPTIONS)
+    # chunksize=2: metinler birden fazla işçiye ve parçaya dağılır, sıra korunmalı
+    parallel = preprocess_texts(texts, workers=2, chunksize=2, **NO_NLTK_OPTIONS)
+    assert parallel == serial
+    ids = preprocess_texts(texts, workers=2, chunksize=2, output='ids', dedup=True, **NO_NLTK_OPTIONS)
+    assert ids['processed_texts'].texts() == serial['processed_texts'] and ids['stats'] == serial['stats']
+    print(f"   {len(texts)} metin, 2 işçi: seri sonuçla aynı")
+
+def test_batched_pos_tagging():
+    print("\nToplu POS tagging (tag_sents) testi...")
+    import nltk
+    from main import Pipeline, _get_pos_tagger
+    token_lists = [["the", "cats", "are", "running"], ["dogs", "barked", "loudly"], [], ["running"]]
+    # Tek tagger örneğiyle toplu etiketleme, belge belge nltk.pos_tag ile aynı
+    assert _get_pos_tagger().tag_sents(token_lists) == [nltk.pos_tag(tokens) for tokens in token_lists]
+    pipeline = Pipeline(do_tokenize=False, remove_stopwords=False)
+    texts = [' '.join(tokens) for tokens in token_lists]
+    batched = pipeline.process(texts)
+    assert batched['processed_texts'] == [pipeline.process_one(text)[0] for text in texts]
+    print(f"   {batched['processed_texts']}")
+
+def test_web_hashing_features():
+    print("\nWeb hashing sütun sınırı testi...")
+    client = _web_client(MAX_HASH_FEATURES=4096)
+    texts = ["cats and dogs", "dogs and birds"]
+    response = client.post('/process', json=dict(NO_NLTK_OPTIONS, texts=texts, vector_method='hashing', n_features=2**30))
+    assert response.status_code == 400
+    # max_features da tamsayı ve sınır içinde olmalı
+    for max_features in ('30', None, 0, 10**9, True):
+        response = client.post('/process', json=dict(NO_NLTK_OPTIONS, texts=texts, max_features=max_features))
+        assert response.status_code == 400
+    response = client.post('/process', json=dict(NO_NLTK_OPTIONS, texts=texts, vector_method='hashing', n_features=2048))
+    assert response.status_code == 200 and response.get_json()['feature_count'] == 2048
+    results = client.get(f"/get_results?result_id={response.get_json()['result_id']}").get_json()
+    # 'hash_<i>' adları depoya ve yanıta yazılmaz
+    assert results['feature_names'] == {'hashed': True, 'n_features': 2048}
+    assert results['matrix']['shape'] == [2, 2048]
+    print("   Sınır dışı n_features 400 döndü, sütun adları üretilmedi")
+
+def test_turkish_lemmatization():
+    print("\nTürkçe (spaCy) lemmatization testi...")
+    texts = ["Kitapları okuyorum.", "Çocuklar evlere gittiler.", ""]
+    options = {'language': 'turkish', 'do_tokenize': False, 'remove_stopwords': False}
+    result = preprocess_texts(texts, **options)
+    assert result['processed_texts'] == ['kitap oku', 'çocuk ev git', '']
+    assert [stat['final_word_count'] for stat in result['stats']] == [2, 3, 0]
+    # nlp.pipe grup boyutu sonucu değiştirmez
+    assert preprocess_texts(texts, spacy_batch_size=1, **options)['processed_texts'] == result['processed_texts']
+    print(f"   {result['processed_texts']}")
+
+def test_unsupported_language():
+    print("\nDesteklenmeyen dil testi...")
+    import main
+    import basic_pipeline
+    from text_utils import check_language
+    for language in SUPPORTED_LANGUAGES:
+        check_language(language)
+    for language in ('klingon', 'English', None):
+        try:
+            check_language(language)
+            assert False, 'ValueError bekleniyordu'
+        except ValueError:
+            pass
+    for factory, registry in ((main.get_pipeline, main._pipelines), (get_basic_pipeline, basic_pipeline._pipelines)):
+        before = len(registry)
+        try:
+            factory('klingon')
+            assert False, 'ValueError bekleniyordu'
+        except ValueError:
+            pass
+        assert len(registry) == before
+    response = _web_client().post('/process', json=dict(NO_NLTK_OPTIONS, texts=['hello'], language='klingon'))
+    assert response.status_code == 400
+    print("   Bilinmeyen dil reddedildi, pipeline kaydına eklenmedi")
+
+def test_web_cache_key_normalized():
+    print("\nNormalize edilmiş /process önbellek anahtarı testi...")
+    client = _web_client()
+    texts = ["cats and dogs", "dogs and birds"]
+    client.post('/process', json=dict(NO_NLTK_OPTIONS, texts=texts))
+    # 0 / False ve eksik alan / varsayılan değer aynı anahtarı üretir
+    client.post('/process', json=dict(texts=texts, do_tokenize=0, remove_stopwords=0, do_lemmatization=0, dedup=False))
+    stats = client.application.extensions['process_cache'].stats()
+    assert stats['memory_hits'] == 1 and stats['entries'] == 1
+    print("   Eşdeğer istek önbellekten döndü")
+
+def test_web_async_dedup():
+    print("\nArka plan işinde gruplar arası dedup testi...")
+    import time
+    texts = ["cats and dogs", "birds sing", "Cats  and dogs", "birds sing", "cats and dogs"]
+    options = dict(NO_NLTK_OPTIONS, texts=texts, dedup=True)
+    sync = _web_client().post('/process', json=options).get_json()
+    # JOB_BATCH_SIZE=2: tekrarlar farklı gruplara düşer
+    client = _web_client(JOB_BATCH_SIZE=2)
+    job_url = client.post('/process', json=dict(options, **{'async': True})).get_json()['status_url']
+    for _ in range(100):
+        job = client.get(job_url).get_json()
+        if job['status'] in ('done', 'failed'):
+            break
+        time.sleep(0.05)
+    assert job['status'] == 'done' and job['done'] == len(texts)
+    assert job['result']['duplicate_ratio'] == sync['duplicate_ratio'] == 0.6
+    assert job['result']['stats'] == sync['stats']
+    print(f"   Tekrar oranı: {sync['duplicate_ratio']:.0%} (senkron yol ile aynı)")
+
+def test_web_results_without_plots():
+    print("\nGrafiklerin /get_results dışında tutulması testi...")
+    client = _web_client()
+    texts = ["cats and dogs play", "dogs and birds sing", "cats sleep all day"]
+    result_id = client.post('/process', json=dict(NO_NLTK_OPTIONS, texts=texts)).get_json()['result_id']
+    plots = client.get(f'/generate_plots?result_id={result_id}').get_json()
+    assert set(plots) == {'wordcloud', 'barchart'}
+    results = client.get(f'/get_results?result_id={result_id}').get_json()
+    assert 'plots' not in results and results['processed_texts']
+    print("   /get_results grafik içermiyor")
+
+def test_vectorizer_round_trip():
+    print("\nModel kaydetme/yükleme ve /transform testi...")
+    import numpy as np
+    from main import fit_vectorizer, transform_texts, save_vectorizer, load_vectorizer
+    train = ["cats and dogs play", "dogs and birds sing", "cats sleep all day"]
+    new = ["cats and birds", "unknown words only"]
+    with tempfile.TemporaryDirectory() as model_dir:
+        for method in ('tfidf', 'count'):
+            vectorizer = fit_vectorizer(train, method=method, max_features=5)
+            path = os.path.join(model_dir, f'{method}.npz')
+            save_vectorizer(vectorizer, path, {'language': 'english'})
+            restored, options = load_vectorizer(path)
+            assert options == {'language': 'english'}
+            assert list(restored.get_feature_names_out()) == list(vectorizer.get_feature_names_out())
+            assert np.allclose(transform_texts(restored, new).toarray(), transform_texts(vectorizer, new).toarray())
+
+        client = _web_client(MODEL_DIR=model_dir)
+        options = dict(NO_NLTK_OPTIONS, texts=train, vector_method='hashing', save_model='hashed')
+        response = client.post('/process', json=options)
+        assert response.status_code == 400 and 'hashing' not in response.get_json()['error']
+        # Geçersiz model adı ön işleme başlamadan 400 döner
+        for name in (123, ['demo'], '../demo', '.hidden', ''):
+            assert client.post('/process', json=dict(options, vector_method='tfidf', save_model=name)).status_code == 400
+        response = client.post('/process', json=dict(options, vector_method='tfidf', save_model='demo'))
+        assert response.status_code == 200
+        transformed = client.post('/transform', json={'texts': new, 'model': 'demo'}).get_json()
+        reference = load_vectorizer(os.path.join(model_dir, 'demo.npz'))[0]
+        assert transformed['feature_names'] == list(reference.get_feature_names_out())
+        assert transformed['matrix']['shape'] == [2, len(transformed['feature_names'])]
+        assert client.post('/transform', json={'texts': new, 'model': 'missing'}).status_code == 404
+        assert client.post('/transform?matrix_format=coo', json={'texts': new, 'model': 'demo'}).status_code == 400
+    print("   tfidf/count modelleri aynı sonucu verdi, /transform çalıştı")
+
+def test_matrix_export():
+    print("\nMatris dışa aktarma testi...")
+    import io
+    import csv
+    import zipfile
+    import numpy as np
+    from scipy import sparse
+    from scipy.io import mmread
+    from matrix_export import iter_csv_rows, export_bundle
+    matrix = sparse.csr_matrix(np.array([[0.40993714, 0, 1 / 3], [0, 0, 0], [2.5, 0, 0]], dtype=np.float32))
+    names = ['ai', 'data', 'model']
+    rows = list(csv.reader(io.StringIO(''.join(iter_csv_rows(matrix, names)))))
+    assert rows[0] == [''] + names and rows[1][0] == 'Metin_1'
+    # float32 değerler float32 hassasiyetinde yazılır ve aynen geri okunur
+    assert rows[1][1] == '0.40993714'
+    assert np.array_equal(np.array([r[1:] for r in rows[1:]], dtype=np.float32), matrix.toarray())
+    for fmt, reader in (('npz', sparse.load_npz), ('mtx', mmread)):
+        with zipfile.ZipFile(io.BytesIO(export_bundle(matrix, names, fmt))) as bundle:
+            assert bundle.read('vocabulary.txt').decode('utf-8').split() == names
+            restored = reader(io.BytesIO(bundle.read(f'matrix.{fmt}')))
+        assert np.allclose(sparse.csr_matrix(restored).toarray(), matrix.toarray())
+    print("   csv, npz ve mtx geri okundu")
+
+def test_read_texts_from_file():
+    print("\nDosyadan okuma testi (gzip ve csv sütunları)...")
+    import gzip
+    rows = "id,title,body\n1,First title,First body\n2,,Second body\n3,Third title\n"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'veri.csv')
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(rows)
+        gz_path = os.path.join(tmp_dir, 'veri.csv.gz')
+        with gzip.open(gz_path, 'wt', encoding='utf-8', newline='') as f:
+            f.write(rows)
+        txt_path = os.path.join(tmp_dir, 'veri.txt.gz')
+        with gzip.open(txt_path, 'wt', encoding='utf-8') as f:
+            f.write("first line\n\n  second line  \n")
+
+        # Başlık adıyla: ilk satır başlıktır, boş ve eksik hücreler atlanır
+        assert read_texts_from_file(csv_path, columns=['body']) == ['First body', 'Second body']
+        assert read_texts_from_file(csv_path, columns=['title', 2]) == [
+            'First title', 'First body', 'Second body', 'Third title']
+        # İndeksle: başlık satırı da veri kabul edilir
+        assert read_texts_from_file(csv_path, columns=[1]) == ['title', 'First title', 'Third title']
+        # Sıkıştırılmış dosyalar aynı sonucu verir
+        for columns in (None, ['body'], [1]):
+            assert read_texts_from_file(gz_path, columns=columns) == read_texts_from_file(csv_path, columns=columns)
+        assert read_texts_from_file(txt_path) == ['first line', 'second line']
+        try:
+            read_texts_from_file(csv_path, columns=['missing'])
+            assert False, 'ValueError bekleniyordu'
+        except ValueError:
+            pass
+    print("   gzip, başlık adı ve indeks ile sütun seçimi doğru")
+
 if __name__ == "__main__":
-    test_pipeline() 
\ No newline at end of file
+    test_pipeline()
+    test_lemma_cache()
+    test_basic_vectorize_sparse()
+    test_incremental_tfidf()
+    test_result_store()
+    test_process_cache()
+    test_job_queue()
+    test_benchmark_regression()
+    test_stage_metrics()
+    test_basic_dedup()
+    test_token_ids()
+    test_corpus_cache()
+    test_ngram_pruning()
+    test_vocabulary_cap_pruning()
+    test_pipeline_without_nltk_steps()
+    test_parallel_matches_serial()
+    test_batched_pos_tagging()
+    test_web_hashing_features()
+    test_turkish_lemmatization()
+    test_unsupported_language()
+    test_web_cache_key_normalized()
+    test_web_async_dedup()
+    test_web_results_without_plots()
+    test_vectorizer_round_trip()
+    test_matrix_export()
+    test_read_texts_from_file()
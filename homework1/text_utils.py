@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Pipeline'ların ortak yardımcıları
+- Dil kontrolü (SUPPORTED_LANGUAGES, check_language)
+- Tekrar eden metinler (dedup_texts, fan_out, duplicate_ratio)
+basic_pipeline, simple_pipeline, main ve web uygulamaları bu modülden içe aktarır.
+"""
+
+from token_ids import EncodedCorpus
+
+# Pipeline'ların kabul ettiği diller (kayıtlar dil başına bir örnek tutar; değer istekten gelebilir)
+SUPPORTED_LANGUAGES = ('english', 'turkish')
+
+
+def check_language(language):
+    """Desteklenmeyen dil için ValueError fırlatır."""
+    if language not in SUPPORTED_LANGUAGES:
+        raise ValueError(f"Desteklenmeyen dil: {language}. Seçenekler: {', '.join(SUPPORTED_LANGUAGES)}")
+
+
+# ----------------------
+# Tekrar eden metinler (dedup)
+# ----------------------
+def dedup_texts(texts, lowercase=True):
+    """
+    Metinleri normalize edilmiş hallerine göre (boşluklar tekilleştirilir, lowercase=True ise
+    küçük harf) gruplar. Returns: unique_texts, positions (her girdinin unique_texts'teki indeksi)
+    """
+    index = {}
+    unique_texts = []
+    positions = []
+    for text in texts:
+        key = ' '.join(text.split())
+        if lowercase:
+            key = key.lower()
+        i = index.get(key)
+        if i is None:
+            i = index[key] = len(unique_texts)
+            unique_texts.append(text)
+        positions.append(i)
+    return unique_texts, positions
+
+
+def fan_out(processed_texts, stats, positions):
+    """Tekil sonuçları girdi sırasına geri dağıtır; her belge kendi stats sözlüğünü alır."""
+    if isinstance(processed_texts, EncodedCorpus):
+        return processed_texts.take(positions), [dict(stats[i]) for i in positions]
+    return [processed_texts[i] for i in positions], [dict(stats[i]) for i in positions]
+
+
+def duplicate_ratio(unique_texts, positions):
+    """Tekrar eden (işlenmesi atlanan) belgelerin oranı."""
+    return 1 - len(unique_texts) / len(positions) if positions else 0.0
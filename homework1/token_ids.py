@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Tamsayı Token Kimlikleri (token id)
+- Vocabulary: terim <-> int32 id eşlemesi (her terim için tek bir str nesnesi tutulur)
+- EncodedCorpus: tüm belgelerin id'leri tek bir düz int32 dizisinde, belge sınırları
+  offsets dizisinde (CSR'daki indptr gibi) saklanır
+Ön işleme çıktısı ' '.join ile string'e çevrilip vektörleştiricide tekrar bölünmez;
+vektörleştiriciler ve kelime bulutu id dizilerini doğrudan kullanır.
+"""
+
+from array import array
+
+
+class Vocabulary:
+    """Terimleri ilk görülme sırasıyla 0, 1, 2, ... id'leriyle eşler."""
+
+    def __init__(self, terms=()):
+        self.index = {}
+        self.terms = []
+        for term in terms:
+            self.add(term)
+
+    def add(self, term):
+        """Terimin id'sini döndürür; yeni terimse sözlüğe ekler."""
+        term_id = self.index.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self.index[term] = term_id
+            self.terms.append(term)
+        return term_id
+
+    def get(self, term, default=None):
+        return self.index.get(term, default)
+
+    def encode(self, tokens):
+        add = self.add
+        return array('i', [add(token) for token in tokens])
+
+    def decode(self, ids):
+        terms = self.terms
+        return [terms[i] for i in ids]
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, term):
+        return term in self.index
+
+
+class EncodedCorpus:
+    """
+    Belge listesi: belge i'nin id'leri ids[offsets[i]:offsets[i+1]].
+    ids int32 (array('i')), offsets int64 (array('q')) dizisidir; diskten açılan
+    korpuslarda salt okunur numpy memmap'lerdir (bkz. corpus_cache).
+    """
+
+    def __init__(self, vocabulary=None, ids=None, offsets=None):
+        self.vocabulary = Vocabulary() if vocabulary is None else vocabulary
+        self.ids = array('i') if ids is None else ids
+        self.offsets = array('q', [0]) if offsets is None else offsets
+
+    def append(self, tokens):
+        """Token listesini id'lere çevirip yeni belge olarak ekler."""
+        add = self.vocabulary.add
+        self.ids.extend(add(token) for token in tokens)
+        self.offsets.append(len(self.ids))
+
+    def append_ids(self, ids):
+        self.ids.extend(ids)
+        self.offsets.append(len(self.ids))
+
+    def take(self, positions):
+        """positions sırasıyla belgelerden yeni bir korpus (aynı sözlük) oluşturur."""
+        corpus = EncodedCorpus(self.vocabulary)
+        for i in positions:
+            corpus.append_ids(self[i])
+        return corpus
+
+    def tokens(self, i):
+        return self.vocabulary.decode(self[i])
+
+    def text(self, i):
+        return ' '.join(self.tokens(i))
+
+    def texts(self):
+        """Geriye dönük uyumluluk/görüntüleme için belgelerin string hali."""
+        return [self.text(i) for i in range(len(self))]
+
+    def term_counts(self):
+        """Sözlükteki her id'nin korpustaki toplam geçiş sayısı (id sırasıyla liste)."""
+        if not isinstance(self.ids, array):
+            # numpy/memmap dizisi (ör. corpus_cache'ten açılan korpus): tek geçişte sayılır
+            import numpy as np
+            return np.bincount(self.ids, minlength=len(self.vocabulary)).tolist()
+        counts = [0] * len(self.vocabulary)
+        for term_id in self.ids:
+            counts[term_id] += 1
+        return counts
+
+    def count_matrix(self):
+        """Belge x sözlük ham sayım matrisi (scipy CSR, int64); tokenlar yeniden bölünmez."""
+        import numpy as np
+        from scipy import sparse
+        # Kopya alınır: array görünümü (view) açıkken büyütülemez, memmap ise salt okunurdur
+        indices = np.array(self.ids, dtype=np.int32)
+        indptr = np.array(self.offsets, dtype=np.int64)
+        X = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int64), indices, indptr),
+            shape=(len(self), len(self.vocabulary))
+        )
+        # Aynı satırdaki tekrar eden id'ler toplanır
+        X.sum_duplicates()
+        return X
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
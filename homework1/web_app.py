@@ -3,175 +3,547 @@
 Flask Web Arayüzü: NLP Ön İşleme ve Vektörleştirme Pipeline
 Streamlit sorununu çözmek için alternatif web arayüzü
 """
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Blueprint, Response, current_app, render_template, request, jsonify, send_file
 import os
+import gc
 import io
 import base64
-import matplotlib
-matplotlib.use('Agg')  # GUI olmadan çalışması için
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
+import threading
 import numpy as np
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Pipeline fonksiyonlarını içe aktar
-from main import preprocess_texts, vectorize_texts, check_text_quality
+import metrics
+from jobs import JobQueue
+from lemma_cache import wordnet_cache
+from result_store import ResultStore
+from process_cache import ProcessCache, cache_key
+from matrix_export import EXPORT_FORMATS, iter_csv_rows, export_bundle
+from text_utils import SUPPORTED_LANGUAGES, dedup_texts, fan_out, duplicate_ratio
+from main import (
+    get_pipeline, vectorize_texts, check_text_quality, column_sums,
+    fit_vectorizer, transform_texts, save_vectorizer, load_vectorizer, warm_up,
+    term_frequencies, WORDCLOUD_TOP_K, HashedFeatureNames
+)
 
-app = Flask(__name__)
+bp = Blueprint('nlp', __name__)
 
-# Global değişkenler sonuçları saklamak için
-current_results = {}
+def result_store():
+    """Uygulamaya ait sonuç deposu (create_app içinde kurulur)."""
+    return current_app.extensions['result_store']
 
-@app.route('/')
+def process_cache():
+    """Uygulamaya ait içerik adresli /process önbelleği (create_app içinde kurulur)."""
+    return current_app.extensions['process_cache']
+
+def _get_result():
+    """?result_id= ile istenen sonucu döndürür; yoksa (None, hata yanıtı)."""
+    result_id = request.args.get('result_id')
+    if not result_id:
+        return None, (jsonify({'error': 'result_id gerekli!'}), 400)
+    result = result_store().get(result_id)
+    if result is None:
+        return None, (jsonify({'error': 'Sonuç bulunamadı veya süresi doldu!'}), 404)
+    return result, None
+
+# Yüklenmiş modeller: ad -> (dosya değişiklik zamanı, vectorizer, ön işleme ayarları)
+_models = {}
+# İstek thread'leri _models'i birlikte okuyup yazar
+_models_lock = threading.Lock()
+
+def _valid_model_name(name):
+    # Yalnızca düz dosya adlarına izin verilir (klasör dışına çıkılamaz)
+    return isinstance(name, str) and bool(name) and os.path.basename(name) == name and not name.startswith('.')
+
+def _model_path(name):
+    if not _valid_model_name(name):
+        raise ValueError('Geçersiz model adı!')
+    return os.path.join(current_app.config['MODEL_DIR'], f'{name}.npz')
+
+def get_model(name):
+    """Modeli diskten bir kez yükler; dosya değişirse yeniden yükler."""
+    path = _model_path(name)
+    mtime = os.path.getmtime(path)
+    with _models_lock:
+        cached = _models.get(name)
+    if cached is None or cached[0] != mtime:
+        # Yükleme kilit dışında yapılır; diğer modellere erişen istekler beklemez
+        vectorizer, preprocess_options = load_vectorizer(path)
+        cached = (mtime, vectorizer, preprocess_options)
+        with _models_lock:
+            _models[name] = cached
+    return cached[1], cached[2]
+
+@bp.route('/')
 def index():
     return render_template('index.html')
 
-@app.route('/process', methods=['POST'])
+PREPROCESS_OPTIONS = ('language', 'do_tokenize', 'do_lowercase', 'remove_stopwords', 'do_lemmatization', 'use_pos_tagging')
+
+def process_options(data):
+    """
+    /process isteğindeki ayarlar, varsayılanlar uygulanmış ve normalize edilmiş halde.
+    run_process ve önbellek anahtarı aynı sözlüğü kullanır: eşdeğer istekler (ör. 1 ve true) aynı anahtarı üretir.
+    """
+    return {
+        'language': data.get('language', 'english'),
+        # Bayraklar bool'a çevrilir: Pipeline kaydı yapılandırma başına bir örnek tutar
+        'do_tokenize': bool(data.get('do_tokenize', True)),
+        'do_lowercase': bool(data.get('do_lowercase', True)),
+        'remove_stopwords': bool(data.get('remove_stopwords', True)),
+        'do_lemmatization': bool(data.get('do_lemmatization', True)),
+        'use_pos_tagging': bool(data.get('use_pos_tagging', True)),
+        'vector_method': data.get('vector_method', 'tfidf'),
+        'max_features': data.get('max_features', 30),
+        'n_features': data.get('n_features', 1024),
+        'use_idf': bool(data.get('use_idf', False)),
+        'dedup': bool(data.get('dedup', False))
+    }
+
+def run_process(data, progress=None):
+    """
+    Ön işleme + vektörleştirme + kalite kontrolü; sonucu depoya yazar ve yanıt sözlüğünü döndürür.
+    progress verilirse ön işleme JOB_BATCH_SIZE'lık gruplarla yapılır ve progress(işlenen) çağrılır.
+    """
+    texts = data.get('texts', [])
+    options = process_options(data)
+    vector_method = options['vector_method']
+    max_features = options['max_features']
+    dedup = options['dedup']
+    save_model = data.get('save_model')
+    
+    # Ön işleme (yapılandırma başına tek Pipeline örneği kullanılır)
+    preprocess_options = {name: options[name] for name in PREPROCESS_OPTIONS}
+    pipeline = get_pipeline(**preprocess_options)
+    if progress is None:
+        result = pipeline.process(texts, dedup=dedup)
+        processed = result['processed_texts']
+        stats = result['stats']
+        dup_ratio = result.get('duplicate_ratio', 0.0)
+    else:
+        # Tekrarlar tüm liste üzerinde bir kez bulunur (senkron yol ile aynı sonuç);
+        # gruplara yalnızca tekil metinler girer, sonuçlar en sonda girdi sırasına dağıtılır
+        if dedup:
+            unique_texts, positions = dedup_texts(texts, lowercase=options['do_lowercase'])
+        else:
+            unique_texts, positions = texts, None
+        processed = []
+        stats = []
+        batch_size = current_app.config['JOB_BATCH_SIZE']
+        for start in range(0, len(unique_texts), batch_size):
+            result = pipeline.process(unique_texts[start:start + batch_size])
+            processed.extend(result['processed_texts'])
+            stats.extend(result['stats'])
+            # İlerleme girdi belgeleri cinsinden bildirilir (toplam: len(texts))
+            progress(len(processed) * len(texts) // len(unique_texts))
+        dup_ratio = 0.0
+        if positions is not None:
+            processed, stats = fan_out(processed, stats, positions)
+            dup_ratio = duplicate_ratio(unique_texts, positions)
+    
+    # Vektörleştirme (sparse CSR + float32; dense kopya hiç oluşturulmaz)
+    if save_model:
+        # Eğitilen model /transform ile tekrar kullanılmak üzere diske yazılır
+        path = _model_path(save_model)
+        vectorizer = fit_vectorizer(processed, method=vector_method, max_features=max_features, dtype=np.float32)
+        os.makedirs(current_app.config['MODEL_DIR'], exist_ok=True)
+        save_vectorizer(vectorizer, path, preprocess_options)
+        feature_names = vectorizer.get_feature_names_out()
+        matrix = transform_texts(vectorizer, processed)
+    else:
+        feature_names, matrix = vectorize_texts(
+            processed,
+            method=vector_method,
+            max_features=max_features,
+            sparse=True,
+            dtype=np.float32,
+            n_features=options['n_features'],
+            use_idf=options['use_idf']
+        )
+    
+    # Uyarılar
+    warnings = check_text_quality(stats)
+    
+    result = {
+        'original_texts': texts,
+        'processed_texts': processed,
+        'stats': stats,
+        # Hashing modunda HashedFeatureNames olduğu gibi saklanır; 'hash_<i>' listesi üretilmez
+        'feature_names': feature_names if isinstance(feature_names, HashedFeatureNames) else feature_names.tolist(),
+        'matrix': matrix,
+        # WordCloud için en sık terimler; grafikler metinleri yeniden saymaz
+        'term_frequencies': term_frequencies(processed, current_app.config['WORDCLOUD_TOP_K']),
+        'warnings': warnings,
+        'vector_method': vector_method
+    }
+    if dedup:
+        result['duplicate_ratio'] = dup_ratio
+    if not save_model:
+        process_cache().put(process_cache_key(texts, options), result)
+    return store_result(result)
+
+def process_cache_key(texts, options):
+    """Sonucu etkileyen tüm alanların (metinler + process_options ayarları) özeti."""
+    return cache_key(dict(options, texts=texts))
+
+def _hashed_names_to_json(feature_names):
+    # Sütun adları istemcide üretilir: hash_0 ... hash_<n_features-1>
+    return {'hashed': True, 'n_features': len(feature_names)}
+
+def encode_cached_result(result):
+    """Disk önbelleğine yazmadan önce: HashedFeatureNames JSON'a uygun biçime çevrilir."""
+    if isinstance(result['feature_names'], HashedFeatureNames):
+        result = dict(result, feature_names=_hashed_names_to_json(result['feature_names']))
+    return result
+
+def decode_cached_result(result):
+    """Disk önbelleğinden okuduktan sonra: encode_cached_result'ın tersi."""
+    if isinstance(result['feature_names'], dict):
+        result['feature_names'] = HashedFeatureNames(result['feature_names']['n_features'])
+    return result
+
+def store_result(result):
+    """Sonucu kendi kimliğiyle depoya yazar ve /process yanıtını oluşturur."""
+    # Sığ kopya: önbellekteki sözlük, depodaki sonuca eklenen alanlardan etkilenmez
+    result_id = result_store().put(dict(result))
+    response = {
+        'success': True,
+        'result_id': result_id,
+        'message': f"{len(result['original_texts'])} metin başarıyla işlendi",
+        'stats': result['stats'],
+        'warnings': result['warnings'],
+        'feature_count': len(result['feature_names']),
+        'matrix_shape': list(result['matrix'].shape)
+    }
+    if 'duplicate_ratio' in result:
+        response['duplicate_ratio'] = result['duplicate_ratio']
+    return response
+
+@bp.route('/process', methods=['POST'])
 def process_texts():
     try:
         data = request.get_json()
         texts = data.get('texts', [])
-        language = data.get('language', 'english')
-        do_tokenize = data.get('do_tokenize', True)
-        do_lowercase = data.get('do_lowercase', True)
-        remove_stopwords = data.get('remove_stopwords', True)
-        do_lemmatization = data.get('do_lemmatization', True)
-        use_pos_tagging = data.get('use_pos_tagging', True)
-        vector_method = data.get('vector_method', 'tfidf')
         
         if not texts:
             return jsonify({'error': 'Metin girişi gerekli!'}), 400
+        if data.get('language', 'english') not in SUPPORTED_LANGUAGES:
+            return jsonify({'error': f"Desteklenmeyen dil! Seçenekler: {', '.join(SUPPORTED_LANGUAGES)}"}), 400
         
-        # Ön işleme
-        result = preprocess_texts(
-            texts,
-            language=language,
-            do_tokenize=do_tokenize,
-            do_lowercase=do_lowercase,
-            remove_stopwords=remove_stopwords,
-            do_lemmatization=do_lemmatization,
-            use_pos_tagging=use_pos_tagging
-        )
-        processed = result['processed_texts']
-        stats = result['stats']
+        # Model adı iş başlamadan doğrulanır; geçersiz ad ön işleme bittikten sonra 500'e yol açmaz
+        if data.get('save_model') is not None and not _valid_model_name(data['save_model']):
+            return jsonify({'error': 'save_model geçerli bir dosya adı (string) olmalı!'}), 400
         
-        # Vektörleştirme
-        feature_names, matrix = vectorize_texts(processed, method=vector_method)
+        # Hashing sözlük tutmaz: kaydedilip /transform ile tekrar kullanılacak bir model yoktur
+        if data.get('save_model') and data.get('vector_method', 'tfidf') == 'hashing':
+            return jsonify({'error': 'save_model yalnızca tfidf ve count yöntemleriyle kullanılabilir!'}), 400
         
-        # Uyarılar
-        warnings = check_text_quality(stats)
+        # Sözlük tabanlı yöntemlerde en fazla sütun sayısı; sınırsız değer tüm sözlüğü matrise açar
+        max_features = data.get('max_features', 30)
+        max_vocabulary_features = current_app.config['MAX_FEATURES']
+        if isinstance(max_features, bool) or not isinstance(max_features, int) or not 1 <= max_features <= max_vocabulary_features:
+            return jsonify({'error': f'max_features 1 ile {max_vocabulary_features} arasında bir tamsayı olmalı!'}), 400
         
-        # Sonuçları sakla
-        global current_results
-        current_results = {
-            'original_texts': texts,
-            'processed_texts': processed,
-            'stats': stats,
-            'feature_names': feature_names.tolist(),
-            'matrix': matrix.tolist(),
-            'warnings': warnings,
-            'vector_method': vector_method
-        }
+        # Hashing sütun sayısı istemciden gelir; sınırsız bırakılırsa çok büyük diziler ayrılabilir
+        n_features = data.get('n_features', 1024)
+        max_hash_features = current_app.config['MAX_HASH_FEATURES']
+        if isinstance(n_features, bool) or not isinstance(n_features, int) or not 1 <= n_features <= max_hash_features:
+            return jsonify({'error': f'n_features 1 ile {max_hash_features} arasında bir tamsayı olmalı!'}), 400
         
-        return jsonify({
-            'success': True,
-            'message': f'{len(texts)} metin başarıyla işlendi',
-            'stats': stats,
-            'warnings': warnings,
-            'feature_count': len(feature_names),
-            'matrix_shape': matrix.shape
-        })
+        # Aynı metin + ayar kombinasyonu daha önce işlendiyse pipeline hiç çalışmaz
+        if not data.get('save_model'):
+            cached = process_cache().get(process_cache_key(texts, process_options(data)))
+            if cached is not None:
+                return jsonify(store_result(cached))
+        
+        # Büyük gönderimler (veya async=true) arka plandaki iş kuyruğuna aktarılır
+        threshold = current_app.config['ASYNC_THRESHOLD']
+        if data.get('async') or (threshold is not None and len(texts) >= threshold):
+            app = current_app._get_current_object()
+            
+            def job(progress):
+                with app.app_context():
+                    return run_process(data, progress)
+            
+            job_id = current_app.extensions['job_queue'].submit(job, total=len(texts))
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status_url': f'/jobs/{job_id}'
+            }), 202
+        
+        return jsonify(run_process(data))
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/get_results')
+@bp.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Arka plan işinin durumu, ilerlemesi (done/total) ve bittiyse sonucu."""
+    job = current_app.extensions['job_queue'].get(job_id)
+    if job is None:
+        return jsonify({'error': 'İş bulunamadı!'}), 404
+    return jsonify(job)
+
+# /get_results ve /transform için izin verilen matrix_format değerleri
+MATRIX_FORMATS = ('csr', 'dense')
+
+def matrix_to_json(matrix, matrix_format='csr'):
+    """Sparse matrisi JSON'a uygun hale getirir; 'dense' yalnızca açıkça istenirse üretilir."""
+    if matrix_format == 'dense':
+        return matrix.toarray().tolist()
+    return {
+        'format': 'csr',
+        'shape': list(matrix.shape),
+        'data': matrix.data.tolist(),
+        'indices': matrix.indices.tolist(),
+        'indptr': matrix.indptr.tolist()
+    }
+
+@bp.route('/get_results')
 def get_results():
-    if not current_results:
-        return jsonify({'error': 'Henüz işlenmiş veri yok!'}), 404
+    current_results, error = _get_result()
+    if error:
+        return error
     
-    return jsonify(current_results)
+    matrix_format = request.args.get('matrix_format', 'csr')
+    if matrix_format not in MATRIX_FORMATS:
+        return jsonify({'error': 'matrix_format csr veya dense olmalı!'}), 400
+    results = dict(current_results)
+    # Önbelleklenmiş grafikler (base64 PNG) yalnızca /generate_plots ile döner
+    results.pop('plots', None)
+    results['matrix'] = matrix_to_json(current_results['matrix'], matrix_format)
+    if isinstance(results['feature_names'], HashedFeatureNames):
+        results['feature_names'] = _hashed_names_to_json(results['feature_names'])
+    return jsonify(results)
+
+@bp.route('/transform', methods=['POST'])
+def transform():
+    """Kaydedilmiş bir modelle yeni metinleri dönüştürür; yeniden eğitim yapılmaz."""
+    try:
+        data = request.get_json()
+        texts = data.get('texts', [])
+        model = data.get('model')
+        
+        if not texts or not model:
+            return jsonify({'error': 'texts ve model alanları gerekli!'}), 400
+        matrix_format = request.args.get('matrix_format', 'csr')
+        if matrix_format not in MATRIX_FORMATS:
+            return jsonify({'error': 'matrix_format csr veya dense olmalı!'}), 400
+        
+        try:
+            vectorizer, preprocess_options = get_model(model)
+        except (ValueError, OSError):
+            return jsonify({'error': f'Model bulunamadı: {model}'}), 404
+        
+        # Model eğitilirken kullanılan ön işleme ayarları aynen uygulanır
+        result = get_pipeline(**preprocess_options).process(texts)
+        matrix = transform_texts(vectorizer, result['processed_texts'])
+        
+        return jsonify({
+            'success': True,
+            'processed_texts': result['processed_texts'],
+            'stats': result['stats'],
+            'feature_names': vectorizer.get_feature_names_out().tolist(),
+            'matrix': matrix_to_json(matrix, matrix_format)
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-@app.route('/download_matrix')
+@bp.route('/download_matrix')
 def download_matrix():
-    if not current_results:
-        return jsonify({'error': 'Henüz işlenmiş veri yok!'}), 404
+    """
+    ?format=csv (varsayılan, akış halinde) | npz | mtx | parquet
+    İkili formatlar sözlük dosyasıyla birlikte zip olarak indirilir.
+    """
+    current_results, error = _get_result()
+    if error:
+        return error
+    
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"format şunlardan biri olmalı: {', '.join(EXPORT_FORMATS)}"}), 400
     
     try:
-        # DataFrame oluştur
-        df = pd.DataFrame(
-            current_results['matrix'],
-            columns=current_results['feature_names'],
-            index=[f'Metin_{i+1}' for i in range(len(current_results['matrix']))]
-        )
+        matrix = current_results['matrix']
+        feature_names = current_results['feature_names']
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # CSV olarak kaydet
-        output = io.StringIO()
-        df.to_csv(output, index=True, encoding='utf-8')
-        output.seek(0)
+        if fmt == 'csv':
+            # CSV satır satır üretilip gönderilir; dosyanın tamamı bellekte tutulmaz
+            return Response(
+                iter_csv_rows(matrix, feature_names),
+                mimetype='text/csv',
+                headers={'Content-Disposition': f'attachment; filename=nlp_matrix_{timestamp}.csv'}
+            )
         
         return send_file(
-            io.BytesIO(output.getvalue().encode('utf-8')),
-            mimetype='text/csv',
+            io.BytesIO(export_bundle(matrix, feature_names, fmt)),
+            mimetype='application/zip',
             as_attachment=True,
-            download_name=f'nlp_matrix_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+            download_name=f'nlp_matrix_{timestamp}_{fmt}.zip'
         )
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/generate_plots')
+@bp.route('/metrics')
+def metrics_endpoint():
+    """Prometheus formatında aşama süreleri, istek süreleri ve önbellek istatistikleri."""
+    body = metrics.REGISTRY.render() + metrics.render_stats({
+        'lemma_cache': wordnet_cache.stats(),
+        'process_cache': process_cache().stats(),
+        'result_store': result_store().stats(),
+        'jobs': current_app.extensions['job_queue'].stats()
+    })
+    return Response(body, content_type=metrics.CONTENT_TYPE)
+
+# ----------------------
+# Grafikler
+# ----------------------
+def _figure_to_base64(fig):
+    img_buffer = io.BytesIO()
+    fig.savefig(img_buffer, format='png', bbox_inches='tight')
+    return base64.b64encode(img_buffer.getvalue()).decode()
+
+def _render_wordcloud(frequencies):
+    # pyplot'un global durumu yerine isteğe özel Figure: eşzamanlı istekler birbirini bozmaz
+    from matplotlib.figure import Figure
+    from wordcloud import WordCloud
+    
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
+    wc = WordCloud(width=800, height=400, background_color='white', max_words=max(1, len(frequencies)))
+    wc.generate_from_frequencies(frequencies)
+    ax.imshow(wc, interpolation='bilinear')
+    ax.axis('off')
+    ax.set_title('Word Cloud')
+    return _figure_to_base64(fig)
+
+def _render_barchart(feature_names, matrix):
+    from matplotlib.figure import Figure
+    
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
+    word_scores = column_sums(matrix)
+    top_n = min(10, len(feature_names))
+    top_idx = np.argsort(word_scores)[::-1][:top_n]
+    ax.bar([feature_names[i] for i in top_idx], word_scores[top_idx])
+    ax.set_title('En Sık Kelimeler')
+    ax.set_xlabel('Kelime')
+    ax.set_ylabel('Ağırlık')
+    ax.tick_params(axis='x', labelrotation=45)
+    return _figure_to_base64(fig)
+
+@bp.route('/generate_plots')
 def generate_plots():
-    if not current_results:
-        return jsonify({'error': 'Henüz işlenmiş veri yok!'}), 404
+    current_results, error = _get_result()
+    if error:
+        return error
     
     try:
-        processed = current_results['processed_texts']
-        feature_names = current_results['feature_names']
-        matrix = np.array(current_results['matrix'])
-        
-        # WordCloud
-        plt.figure(figsize=(10, 5))
-        text = ' '.join(processed)
-        wc = WordCloud(width=800, height=400, background_color='white').generate(text)
-        plt.imshow(wc, interpolation='bilinear')
-        plt.axis('off')
-        plt.title('Word Cloud')
-        
-        # Base64'e çevir
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', bbox_inches='tight')
-        img_buffer.seek(0)
-        wordcloud_b64 = base64.b64encode(img_buffer.getvalue()).decode()
-        plt.close()
-        
-        # Bar Chart
-        plt.figure(figsize=(10, 5))
-        word_scores = matrix.sum(axis=0)
-        top_n = min(10, len(feature_names))
-        top_idx = np.argsort(word_scores)[::-1][:top_n]
-        plt.bar([feature_names[i] for i in top_idx], word_scores[top_idx])
-        plt.title('En Sık Kelimeler')
-        plt.xlabel('Kelime')
-        plt.ylabel('Ağırlık')
-        plt.xticks(rotation=45)
-        
-        # Base64'e çevir
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', bbox_inches='tight')
-        img_buffer.seek(0)
-        barchart_b64 = base64.b64encode(img_buffer.getvalue()).decode()
-        plt.close()
+        # Grafikler sonuç başına bir kez çizilir; sonuç değişmediği sürece önbellekten döner
+        plots = current_results.get('plots')
+        if plots is None:
+            # WordCloud ve bar grafiği işçi havuzunda aynı anda çizilir
+            executor = current_app.extensions['plot_executor']
+            wordcloud_future = executor.submit(_render_wordcloud, current_results['term_frequencies'])
+            barchart_future = executor.submit(
+                _render_barchart, current_results['feature_names'], current_results['matrix']
+            )
+            plots = {
+                'wordcloud': wordcloud_future.result(),
+                'barchart': barchart_future.result()
+            }
+            result_store().update(request.args['result_id'], plots=plots)
         
-        return jsonify({
-            'wordcloud': wordcloud_b64,
-            'barchart': barchart_b64
-        })
+        return jsonify(plots)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# ----------------------
+# Uygulama fabrikası ve ısınma (warm-up)
+# ----------------------
+def warm_up_app(app):
+    """Dil kaynaklarını ve grafik kütüphanelerini ilk istekten önce yükler."""
+    warm_up(app.config['WARMUP_LANGUAGES'])
+    import matplotlib.figure
+    import matplotlib.backends.backend_agg
+    import wordcloud
+    # Yüklenen nesneleri GC takibinden çıkar: fork edilen işçilerde bu sayfalara
+    # dokunulmaz ve copy-on-write ile paylaşılmaya devam eder
+    gc.freeze()
+
+def create_app(config=None, warmup=True):
+    """
+    Uygulama fabrikası.
+    warmup=True ise tüm dil kaynakları uygulama istek almadan önce yüklenip çalıştırılır.
+    Çok işçili WSGI sunucularında uygulamayı önceden yükleyin; kaynaklar fork sonrası
+    işçiler arasında paylaşılır:
+        gunicorn --preload -w 4 -b 0.0.0.0:5000 "web_app:create_app()"
+    """
+    app = Flask(__name__)
+    # Eğitilmiş vektörleştirici modellerinin (.npz) saklandığı klasör
+    app.config['MODEL_DIR'] = os.environ.get('NLPLAY_MODEL_DIR', 'models')
+    app.config['WARMUP_LANGUAGES'] = ('english', 'turkish')
+    # Sonuç deposu: adet, yaşam süresi (saniye) ve bellek bütçesi (bayt) sınırları
+    app.config['RESULT_STORE_MAX_ENTRIES'] = 100
+    app.config['RESULT_STORE_TTL'] = 3600
+    app.config['RESULT_STORE_MAX_BYTES'] = 512 * 1024**2
+    # Bu sayıda veya daha fazla metin içeren /process istekleri arka planda çalışır (None: kapalı)
+    app.config['ASYNC_THRESHOLD'] = 5000
+    app.config['JOB_WORKERS'] = 2
+    app.config['JOB_BATCH_SIZE'] = 500
+    # WordCloud ve bar grafiğini paralel çizen işçi sayısı
+    app.config['PLOT_WORKERS'] = 4
+    # WordCloud'a verilen en sık terim sayısı
+    app.config['WORDCLOUD_TOP_K'] = WORDCLOUD_TOP_K
+    # Aşama süreleri ve istek süresi ölçümleri (/metrics)
+    app.config['METRICS_ENABLED'] = True
+    # /process önbelleği: bellek katmanı sınırları ve isteğe bağlı disk katmanı
+    app.config['PROCESS_CACHE_MAX_ENTRIES'] = 256
+    app.config['PROCESS_CACHE_MAX_BYTES'] = 256 * 1024**2
+    app.config['PROCESS_CACHE_DIR'] = os.environ.get('NLPLAY_CACHE_DIR')
+    app.config['PROCESS_CACHE_DISK_MAX_BYTES'] = 1024**3
+    # tfidf / count yöntemlerinde istek başına izin verilen en fazla max_features
+    app.config['MAX_FEATURES'] = 10000
+    # Hashing yönteminde istek başına izin verilen en fazla sütun sayısı
+    app.config['MAX_HASH_FEATURES'] = 2**20
+    if config:
+        app.config.update(config)
+    app.extensions['process_cache'] = ProcessCache(
+        max_entries=app.config['PROCESS_CACHE_MAX_ENTRIES'],
+        max_bytes=app.config['PROCESS_CACHE_MAX_BYTES'],
+        disk_dir=app.config['PROCESS_CACHE_DIR'],
+        disk_max_bytes=app.config['PROCESS_CACHE_DISK_MAX_BYTES'],
+        encode=encode_cached_result,
+        decode=decode_cached_result
+    )
+    app.extensions['job_queue'] = JobQueue(max_workers=app.config['JOB_WORKERS'])
+    app.extensions['plot_executor'] = ThreadPoolExecutor(
+        max_workers=app.config['PLOT_WORKERS'], thread_name_prefix='nlp-plot'
+    )
+    app.extensions['result_store'] = ResultStore(
+        max_entries=app.config['RESULT_STORE_MAX_ENTRIES'],
+        ttl=app.config['RESULT_STORE_TTL'],
+        max_bytes=app.config['RESULT_STORE_MAX_BYTES']
+    )
+    if app.config['METRICS_ENABLED']:
+        metrics.enable()
+        metrics.instrument_app(app, 'web_app')
+    app.register_blueprint(bp)
+    if warmup:
+        warm_up_app(app)
+    return app
+
+# Geriye dönük uyumluluk için (ör. 'flask --app web_app run'); ısınma yapılmaz
+app = create_app(warmup=False)
+
 if __name__ == '__main__':
     # Templates klasörü oluştur
     if not os.path.exists('templates'):
@@ -182,5 +554,6 @@ if __name__ == '__main__':
         os.makedirs('static')
     
     print("Flask web uygulaması başlatılıyor...")
+    app = create_app()
     print("Tarayıcınızda http://localhost:5000 adresini açın")
     app.run(debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file